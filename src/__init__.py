@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules in src import each other by bare name (they run as scripts from src/),
+# so make that work when they are imported as the src package too, e.g. from test/
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,240 @@
+import os
+import json
+import numpy as np
+
+FORMAT_VERSION = 1
+
+def squared_norms(vectors, chunk_size=65536):
+    """Squared L2 norm of every row, in chunks so a memory-mapped array is never copied whole"""
+    norms = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        norms[start:start + chunk_size] = np.einsum('ij,ij->i', chunk, chunk)
+    return norms
+
+class IVFIndex:
+    def __init__(self, dimension, nlist=None, nprobe=8):
+        """
+        Inverted-file (IVF) approximate nearest-neighbour index in NumPy.
+
+        Vectors are clustered with spherical k-means into `nlist` lists. A query
+        only scans the `nprobe` lists whose centroids are closest, so raising
+        nprobe trades latency for recall (nprobe == nlist is exact search).
+
+        Vectors added after training are kept in a pending buffer that is scanned
+        exhaustively until it is merged into the lists. The centroids are retrained
+        once the index has grown 4x since the last training.
+
+        Args:
+            dimension (int): Vector dimension
+            nlist (int, optional): Number of lists. Defaults to sqrt(n) at training time.
+            nprobe (int): Number of lists scanned per query
+        """
+        self.dimension = dimension
+        self.nlist = nlist
+        self.auto_nlist = nlist is None
+        self.nprobe = nprobe
+        self.centroids = None
+        self.trained_size = 0
+        # Indexed vectors, grouped by list: list i is rows offsets[i]:offsets[i + 1]
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.offsets = None
+        self._squared_norms = np.zeros(0, dtype=np.float32)
+        self._pending_vectors = []
+        self._pending_ids = []
+
+    def __len__(self):
+        return len(self.ids) + sum(len(ids) for ids in self._pending_ids)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def train(self, vectors, iterations=15, sample_size=None, seed=0):
+        """
+        Learn list centroids with spherical k-means on (a sample of) the vectors.
+
+        Args:
+            vectors (np.ndarray): Training vectors, shape (n, dimension)
+            iterations (int): k-means iterations
+            sample_size (int, optional): Train on at most this many vectors. Defaults to 64 per list.
+            seed (int): Random seed
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.trained_size = len(vectors)
+        nlist = max(1, int(np.sqrt(len(vectors)))) if self.auto_nlist else self.nlist
+        self.nlist = min(nlist, len(vectors))
+
+        rng = np.random.default_rng(seed)
+        sample_size = sample_size or max(64 * self.nlist, 10000)
+        if len(vectors) > sample_size:
+            vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+        centroids = vectors[rng.choice(len(vectors), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = self._assign(vectors, centroids)
+            counts = np.bincount(assignment, minlength=self.nlist)
+            order = np.argsort(assignment, kind='stable')
+            sums = np.zeros_like(centroids)
+            non_empty = counts > 0
+            sums[non_empty] = np.add.reduceat(vectors[order], np.cumsum(counts)[non_empty] - counts[non_empty])
+            # Re-seed empty lists with random training vectors
+            empty = counts == 0
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        self.offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+
+    @staticmethod
+    def _assign(vectors, centroids, batch_size=65536):
+        """Return the index of the closest centroid (by inner product) for each vector"""
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), batch_size):
+            assignment[start:start + batch_size] = np.argmax(vectors[start:start + batch_size] @ centroids.T, axis=1)
+        return assignment
+
+    def add(self, vectors, ids):
+        """
+        Add vectors incrementally. Trains on the first batch if the index is untrained.
+
+        Args:
+            vectors (np.ndarray): Shape (n, dimension)
+            ids (np.ndarray): Integer id per vector, returned by search
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(vectors) == 0:
+            return
+        if not self.is_trained:
+            self.train(vectors)
+        self._pending_vectors.append(vectors)
+        self._pending_ids.append(ids)
+
+        # Merging re-sorts everything, so only do it once the pending buffer is large
+        pending = sum(len(pending_ids) for pending_ids in self._pending_ids)
+        if pending >= max(4096, len(self.ids) // 20):
+            self.merge()
+
+    def merge(self):
+        """Move pending vectors into their lists, retraining if the index has grown 4x"""
+        if not self._pending_ids:
+            return
+        if len(self.ids) == 0 and len(self._pending_ids) == 1:
+            # Bulk build, avoid copying a large catalog twice
+            vectors, ids = self._pending_vectors[0], self._pending_ids[0]
+        else:
+            vectors = np.vstack([self.vectors] + self._pending_vectors)
+            ids = np.concatenate([self.ids] + self._pending_ids)
+        self._pending_vectors = []
+        self._pending_ids = []
+
+        if len(vectors) >= 4 * self.trained_size:
+            self.train(vectors)
+
+        assignment = self._assign(vectors, self.centroids)
+        order = np.argsort(assignment, kind='stable')
+        self.vectors = np.ascontiguousarray(vectors[order])
+        self.ids = ids[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=self.nlist))])
+        self._squared_norms = squared_norms(self.vectors)
+
+    def search(self, queries, k=1, nprobe=None):
+        """
+        Find the approximate k nearest vectors for each query.
+
+        Args:
+            queries (np.ndarray): Shape (n_queries, dimension)
+            k (int): Number of neighbours per query
+            nprobe (int, optional): Lists to scan, overrides self.nprobe
+
+        Returns:
+            tuple: (distances, ids), each a list with one array per query, sorted by
+            increasing squared L2 distance
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, self.nlist or 1)
+
+        pending_vectors = np.vstack(self._pending_vectors) if self._pending_vectors else None
+        pending_ids = np.concatenate(self._pending_ids) if self._pending_ids else None
+        pending_norms = squared_norms(pending_vectors) if pending_vectors is not None else None
+
+        all_distances, all_ids = [], []
+        if self.is_trained:
+            probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        for row, query in enumerate(queries):
+            blocks = []
+            if self.is_trained and len(self.ids):
+                for l in probes[row]:
+                    start, end = self.offsets[l], self.offsets[l + 1]
+                    if end > start:
+                        distances = self._squared_norms[start:end] - 2.0 * (self.vectors[start:end] @ query)
+                        blocks.append((distances, self.ids[start:end]))
+            if pending_vectors is not None:
+                distances = pending_norms - 2.0 * (pending_vectors @ query)
+                blocks.append((distances, pending_ids))
+
+            if not blocks:
+                all_distances.append(np.zeros(0, dtype=np.float32))
+                all_ids.append(np.zeros(0, dtype=np.int64))
+                continue
+
+            distances = np.concatenate([block[0] for block in blocks]) + float(query @ query)
+            ids = np.concatenate([block[1] for block in blocks])
+            top = min(k, len(ids))
+            nearest = np.argpartition(distances, top - 1)[:top]
+            nearest = nearest[np.argsort(distances[nearest])]
+            all_distances.append(distances[nearest])
+            all_ids.append(ids[nearest])
+        return all_distances, all_ids
+
+    def save(self, path):
+        """
+        Save the index to a directory. Pending vectors are saved as they are, without merging.
+
+        Args:
+            path (str): Directory to write ivf.json and the .npy arrays to
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(path, "squared_norms.npy"), self._squared_norms)
+        np.save(os.path.join(path, "pending_vectors.npy"),
+                np.vstack(self._pending_vectors) if self._pending_vectors
+                else np.zeros((0, self.dimension), dtype=np.float32))
+        np.save(os.path.join(path, "pending_ids.npy"),
+                np.concatenate(self._pending_ids) if self._pending_ids else np.zeros(0, dtype=np.int64))
+        with open(os.path.join(path, "ivf.json"), 'w') as f:
+            json.dump({"format_version": FORMAT_VERSION, "dimension": self.dimension, "nlist": self.nlist,
+                       "auto_nlist": self.auto_nlist, "nprobe": self.nprobe, "trained_size": self.trained_size}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load an index saved with save(). Arrays are memory-mapped read-only by default.
+
+        Args:
+            path (str): Directory written by save()
+            mmap (bool): Memory-map the arrays instead of reading them into memory
+
+        Returns:
+            IVFIndex: The loaded index
+        """
+        with open(os.path.join(path, "ivf.json")) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported IVF index format version {meta.get('format_version')} in {path}")
+
+        index = cls(meta["dimension"], meta["nlist"], meta["nprobe"])
+        index.auto_nlist = meta["auto_nlist"]
+        index.trained_size = meta["trained_size"]
+        mmap_mode = 'r' if mmap else None
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode))
+        index._squared_norms = np.load(os.path.join(path, "squared_norms.npy"), mmap_mode=mmap_mode)
+        pending_ids = np.load(os.path.join(path, "pending_ids.npy"))
+        if len(pending_ids):
+            index._pending_vectors = [np.load(os.path.join(path, "pending_vectors.npy"))]
+            index._pending_ids = [pending_ids]
+        return index
@@ -0,0 +1,54 @@
+POLICIES = ("fixed", "adaptive", "offline")
+
+class ChunkScheduler:
+    def __init__(self, policy="fixed", frames=1024, min_frames=512, max_frames=4096):
+        """
+        Choose how many frames to read and feed to the recognizer per call.
+
+        Every AcceptWaveform call has a fixed overhead, so large chunks give
+        better throughput, while small chunks let an utterance end sooner.
+
+        Policies:
+            fixed:    always `frames`
+            adaptive: `min_frames` while speech is active, then doubling on every
+                      silent chunk up to `max_frames`
+            offline:  always `max_frames`, for WAV files and batch processing
+
+        Args:
+            policy (str): One of 'fixed', 'adaptive' or 'offline'
+            frames (int): Chunk size for the fixed policy
+            min_frames (int): Smallest chunk, used while speech is active
+            max_frames (int): Largest chunk, used in steady-state silence and offline
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown chunk policy '{policy}', choose one of {POLICIES}")
+        self.policy = policy
+        self.frames = frames
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        self.current = min_frames
+
+    def next_size(self):
+        """Return the number of frames to read next"""
+        if self.policy == "fixed":
+            return self.frames
+        if self.policy == "offline":
+            return self.max_frames
+        return self.current
+
+    def update(self, result, partial):
+        """
+        Adapt the chunk size to the last recognizer output.
+
+        Args:
+            result (dict): Final result from the last chunk, or None
+            partial (dict): Partial result from the last chunk, or None
+        """
+        if partial and partial.get("partial", "").strip():
+            # Speech in progress, keep chunks small so the endpoint is detected quickly
+            self.current = self.min_frames
+        elif result is not None:
+            # Utterance just ended, start growing from the smallest chunk
+            self.current = self.min_frames
+        else:
+            self.current = min(self.current * 2, self.max_frames)
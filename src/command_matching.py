@@ -0,0 +1,82 @@
+import numpy as np
+
+NBEST_TEMPERATURE = 10.0  # Scale of Vosk confidence differences between alternatives
+
+def match_command(commands_collection, text, match_threshold=None):
+    """
+    Find the best matching voice command for a text.
+
+    Args:
+        commands_collection: CommandStore or ChromaDB collection of commands with an 'action' metadata
+        text (str): Recognized speech text
+        match_threshold (float, optional): Reject matches whose cosine similarity is below this
+
+    Returns:
+        tuple: (matched_text, action) or (None, None) if no match found or it is below match_threshold
+    """
+    if not text.strip():
+        return None, None
+
+    results = commands_collection.query(
+        query_texts=[text],
+        n_results=1
+    )
+
+    if results['documents'] and results['documents'][0]:
+        # Squared L2 distance between unit vectors is 2 - 2 * cosine similarity
+        if match_threshold is not None and 1.0 - results['distances'][0][0] / 2.0 < match_threshold:
+            return None, None
+        matched_text = results['documents'][0][0]
+        matched_action = results['metadatas'][0][0]['action']
+        return matched_text, matched_action
+    return None, None
+
+def match_command_nbest(commands_collection, encode, alternatives, match_threshold=None,
+                        temperature=NBEST_TEMPERATURE):
+    """
+    Find the best matching voice command over all N-best ASR hypotheses.
+
+    All alternatives are embedded in one batched call. Each command is scored by
+    its cosine similarity to every alternative, weighted by the alternative's
+    ASR posterior (softmax over Vosk confidences), and the highest score wins.
+
+    Args:
+        commands_collection: CommandStore or ChromaDB collection of commands with an 'action' metadata
+        encode (Callable): Embeds a list of texts the way the collection's embedding function does
+        alternatives (list): Vosk 'alternatives' list of {'text', 'confidence'} dicts
+        match_threshold (float, optional): Reject matches whose fused score is below this
+        temperature (float): Softmax temperature over the confidences
+
+    Returns:
+        tuple: (matched_text, action, score) or (None, None, None) if no match found or it is below match_threshold
+    """
+    alternatives = [a for a in alternatives if a.get("text", "").strip()]
+    n_commands = commands_collection.count()
+    if not alternatives or n_commands == 0:
+        return None, None, None
+
+    confidences = np.array([a.get("confidence", 0.0) for a in alternatives], dtype=np.float64)
+    weights = np.exp((confidences - confidences.max()) / temperature)
+    weights /= weights.sum()
+
+    query_embeddings = np.asarray(encode([a["text"] for a in alternatives]))
+    results = commands_collection.query(
+        query_embeddings=query_embeddings.tolist(),
+        n_results=min(n_commands, 10)
+    )
+
+    scores = {}
+    for weight, ids, documents, metadatas, distances in zip(
+            weights, results['ids'], results['documents'], results['metadatas'], results['distances']):
+        for command_id, document, metadata, distance in zip(ids, documents, metadatas, distances):
+            # Squared L2 distance between unit vectors is 2 - 2 * cosine similarity
+            similarity = 1.0 - distance / 2.0
+            score, _, _ = scores.get(command_id, (0.0, document, metadata))
+            scores[command_id] = (score + weight * similarity, document, metadata)
+
+    if not scores:
+        return None, None, None
+    score, matched_text, metadata = max(scores.values(), key=lambda entry: entry[0])
+    if match_threshold is not None and score < match_threshold:
+        return None, None, None
+    return matched_text, metadata['action'], score
@@ -0,0 +1,401 @@
+import os
+import json
+import fcntl
+import shutil
+import numpy as np
+from ann_index import IVFIndex, squared_norms
+
+FORMAT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+
+def backend_store_path(store_path, embedding_handler):
+    """
+    Directory for one embedding backend inside store_path, so vectors from different backends never mix.
+
+    Args:
+        store_path (str): Root directory of the persistent command stores
+        embedding_handler: Handler with model_name and embedding_tag
+
+    Returns:
+        str: e.g. store_path/all-MiniLM-L6-v2, or store_path/all-MiniLM-L6-v2-dummy for a
+        handler that fell back to placeholder vectors
+    """
+    # The tag is 'name:dimension[:qualifier...]', qualifiers such as 'dummy' get their own directory
+    qualifiers = embedding_handler.embedding_tag.split(":")[2:]
+    return os.path.join(store_path, "-".join([embedding_handler.model_name] + qualifiers))
+
+class CommandStore:
+    # A write appends a segment until there are this many, or until the segments after the
+    # first hold more than max(merge_rows, rows in the first / 20), then all are merged into one
+    max_segments = 16
+    merge_rows = 4096
+
+    def __init__(self, path, embedding_function, index_type="flat", nprobe=8, resolve_path=None):
+        """
+        Persistent on-disk voice command store.
+
+        Provides the subset of the ChromaDB collection API used by VoskService
+        (add, query, count), so it can be used in place of an in-memory collection.
+
+        On-disk format (version 2), all inside `path`:
+            manifest.json          format_version, generation, embedding_tag, dimension,
+                                   the list of segments and the IVF index directory
+            segment-<gen>.json     commands (id, document, metadata) of one segment
+            segment-<gen>.npy      float32 embeddings of those commands
+            segment-<gen>.norms.npy  float32 squared L2 norm of every embedding
+            ivf-<gen>/             IVFIndex over the first segment, only with index_type='ivf'
+
+        Adding commands writes only their rows as a new segment, so the cost of a
+        write does not grow with the catalog. Once there are too many segments, or an
+        existing command changes, everything is merged into a single segment (and the
+        IVF index is rebuilt). Rows are numbered across segments in manifest order.
+
+        Writers take an exclusive flock on `.lock`, write the new files and atomically
+        replace the manifest, then delete files the manifest no longer names. When the
+        manifest changed, readers take a shared flock (opening the lock file read-only,
+        so a read-only volume works) while they read it and memory-map the segments
+        they have not seen yet. Several processes can share one catalog, and a restart
+        does not need to re-embed anything. The store is tagged with the embedding
+        function's `embedding_tag` (backend and dimension) and refuses to mix backends.
+        A lazy embedding function only knows its tag once loaded; with `resolve_path`,
+        the store then moves to the directory for the new tag and re-adds its commands
+        there, instead of raising.
+
+        With index_type='ivf', queries go through an approximate IVF index instead
+        of a brute-force scan, for catalogs with 100k+ entries. Segments written
+        since the last merge are scanned exhaustively.
+
+        Args:
+            path (str): Directory holding the store
+            embedding_function (Callable): ChromaDB-style embedding function (list of str -> list of vectors)
+            index_type (str): 'flat' for exact search or 'ivf' for approximate search
+            nprobe (int): IVF lists scanned per query, higher is slower with better recall
+            resolve_path (Callable, optional): Returns the directory for the embedding function's
+                current tag, e.g. a lambda around backend_store_path(). Defaults to None.
+        """
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index type '{index_type}', choose 'flat' or 'ivf'")
+        self.embedding_function = embedding_function
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.resolve_path = resolve_path
+        self._open(path)
+        print(f"Loaded {len(self.commands)} commands from {path}")
+
+    @classmethod
+    def for_backend(cls, store_path, embedding_handler, **kwargs):
+        """
+        Open the store for an embedding handler inside store_path, see backend_store_path().
+
+        The directory follows the handler's tag, so a lazy handler that falls back to
+        placeholder vectors on loading moves the store to the '-dummy' directory.
+
+        Args:
+            store_path (str): Root directory of the persistent command stores
+            embedding_handler: Handler with model_name, embedding_tag and get_embedding_function()
+            **kwargs: index_type and nprobe
+
+        Returns:
+            CommandStore: The store
+        """
+        return cls(backend_store_path(store_path, embedding_handler), embedding_handler.get_embedding_function(),
+                   resolve_path=lambda: backend_store_path(store_path, embedding_handler), **kwargs)
+
+    def _open(self, path):
+        """Point the store at a directory and load it"""
+        self.path = path
+        self.embedding_tag = getattr(self.embedding_function, "embedding_tag", None)
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+        self.lock_path = os.path.join(path, LOCK_NAME)
+        self.index = None
+        os.makedirs(path, exist_ok=True)
+
+        self.generation = -1
+        self.commands = []
+        self.segments = []
+        self._index_name = None
+        self._manifest_signature = None
+        self._load()
+
+    def _embedding_tag_changed(self):
+        """
+        Compare the embedding function's tag with the store's.
+
+        Returns:
+            bool: True if it changed and the store can follow it with _follow_embedding_tag()
+
+        Raises:
+            ValueError: If it changed and there is no resolve_path
+        """
+        embedding_tag = getattr(self.embedding_function, "embedding_tag", None)
+        if embedding_tag == self.embedding_tag:
+            return False
+        if self.resolve_path is None:
+            raise ValueError(f"Embedding function changed from '{self.embedding_tag}' to '{embedding_tag}', "
+                             f"cannot use its vectors with {self.path}")
+        return True
+
+    def _follow_embedding_tag(self):
+        """Move to the directory for the embedding function's new tag and re-add the commands there"""
+        self._load()
+        commands = self.commands
+        path = self.resolve_path()
+        print(f"Embedding function changed from '{self.embedding_tag}' to "
+              f"'{self.embedding_function.embedding_tag}', moving commands to {path}")
+        self._open(path)
+        if commands:
+            self.add(documents=[command["document"] for command in commands],
+                     ids=[command["id"] for command in commands],
+                     metadatas=[command["metadata"] for command in commands])
+
+    def _manifest_changed(self):
+        """Return the manifest's signature if it differs from the loaded one, else None"""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        # The manifest is replaced, never rewritten in place, so a new inode means a new generation
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        return signature if signature != self._manifest_signature else None
+
+    def _load(self):
+        """(Re)load the manifest and memory-map new segments if the store changed on disk"""
+        if self._manifest_changed() is None:
+            return
+        try:
+            lock = os.open(self.lock_path, os.O_RDONLY)
+        except FileNotFoundError:
+            # No writer has ever locked this store
+            return self._reload()
+        try:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            self._reload()
+        finally:
+            os.close(lock)
+
+    def _reload(self):
+        """Read the manifest and map its files. Must hold the reader or writer lock."""
+        signature = self._manifest_changed()
+        if signature is None:
+            return
+
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported command store format version {manifest.get('format_version')} "
+                             f"in {self.manifest_path}, expected {FORMAT_VERSION}")
+        if manifest.get("embedding_tag") != self.embedding_tag:
+            raise ValueError(f"Command store {self.path} holds '{manifest.get('embedding_tag')}' embeddings, "
+                             f"cannot use it with '{self.embedding_tag}'")
+
+        # Segments never change once written, only the ones not seen yet are read
+        loaded = {segment["name"]: segment for segment in self.segments}
+        self.segments = [loaded.get(name) or self._load_segment(name) for name in manifest["segments"]]
+        self.commands = [command for segment in self.segments for command in segment["commands"]]
+        self.generation = manifest["generation"]
+        if self.index_type == "ivf" and (manifest.get("index") != self._index_name or self.index is None):
+            self.index = self._load_index(manifest.get("index"))
+            self._index_name = manifest.get("index")
+        self._manifest_signature = signature
+
+    def _load_segment(self, name):
+        """Read a segment's commands and memory-map its embeddings and norms"""
+        with open(os.path.join(self.path, f"{name}.json")) as f:
+            commands = json.load(f)
+        return {
+            "name": name,
+            "commands": commands,
+            "embeddings": np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r'),
+            "norms": np.load(os.path.join(self.path, f"{name}.norms.npy"), mmap_mode='r')
+        }
+
+    def _load_index(self, index_name):
+        """Memory-map the IVF index over the first segment, or build one if the writer saved none"""
+        if not self.segments:
+            return None
+        if index_name is not None:
+            index = IVFIndex.load(os.path.join(self.path, index_name))
+        else:
+            embeddings = self.segments[0]["embeddings"]
+            index = IVFIndex(embeddings.shape[1])
+            index.add(embeddings, np.arange(len(embeddings)))
+        index.nprobe = self.nprobe
+        return index
+
+    def _write_segment(self, name, commands, embeddings):
+        """Write a segment's files. Must hold the writer lock."""
+        with open(os.path.join(self.path, f"{name}.json"), 'w') as f:
+            json.dump(commands, f)
+            f.flush()
+            os.fsync(f.fileno())
+        for file_name, array in ((f"{name}.npy", embeddings), (f"{name}.norms.npy", squared_norms(embeddings))):
+            with open(os.path.join(self.path, file_name), 'wb') as f:
+                np.save(f, array)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _publish(self, generation, segment_names, index_name, dimension):
+        """Atomically replace the manifest and delete unreferenced files. Must hold the writer lock."""
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "generation": generation,
+            "embedding_tag": self.embedding_tag,
+            "dimension": dimension,
+            "segments": segment_names,
+            "index": index_name
+        }
+        tmp_manifest = self.manifest_path + ".tmp"
+        with open(tmp_manifest, 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_manifest, self.manifest_path)
+
+        # Readers are locked out until they see the new manifest, and ones that
+        # still map an older file keep it alive until they reload
+        referenced = set(segment_names) | {index_name}
+        for name in os.listdir(self.path):
+            if name.startswith("segment-") and name.split(".")[0] not in referenced:
+                os.remove(os.path.join(self.path, name))
+            elif name.startswith("ivf-") and name not in referenced:
+                shutil.rmtree(os.path.join(self.path, name))
+        self._reload()
+
+    def add(self, documents, ids, metadatas=None):
+        """
+        Add or update commands. Commands whose id, document and metadata are
+        already stored are skipped without being re-embedded.
+
+        Args:
+            documents (List[str]): Command texts
+            ids (List[str]): Unique command identifiers
+            metadatas (List[dict], optional): Metadata per command, e.g. {"action": ...}
+        """
+        metadatas = metadatas or [{} for _ in ids]
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another process may have written since we last looked
+            self._reload()
+
+            rows = {command["id"]: i for i, command in enumerate(self.commands)}
+            new_entries = {}
+            for command_id, document, metadata in zip(ids, documents, metadatas):
+                entry = {"id": command_id, "document": document, "metadata": metadata}
+                i = rows.get(command_id)
+                if i is None or self.commands[i] != entry:
+                    new_entries[command_id] = entry
+            if not new_entries:
+                return
+            new_entries = list(new_entries.values())
+
+            new_embeddings = np.asarray(
+                self.embedding_function([entry["document"] for entry in new_entries]), dtype=np.float32)
+            # A lazy handler only knows after loading whether it fell back to placeholder vectors
+            if not self._embedding_tag_changed():
+                return self._write_entries(rows, new_entries, new_embeddings)
+        # Outside the lock, the store moves to another directory
+        self._follow_embedding_tag()
+        self.add(documents, ids, metadatas)
+
+    def _write_entries(self, rows, new_entries, new_embeddings):
+        """Append new entries as a segment, or merge everything. Must hold the writer lock."""
+        generation = self.generation + 1
+        segment_name = f"segment-{generation}"
+        updated = any(entry["id"] in rows for entry in new_entries)
+        first_rows = len(self.segments[0]["commands"]) if self.segments else 0
+        delta_rows = len(self.commands) - first_rows + len(new_entries)
+        if not updated and self.segments and (len(self.segments) < self.max_segments
+                                              and delta_rows <= max(self.merge_rows, first_rows // 20)):
+            self._write_segment(segment_name, new_entries, new_embeddings)
+            self._publish(generation, [segment["name"] for segment in self.segments] + [segment_name],
+                          self._index_name, int(new_embeddings.shape[1]))
+            return
+
+        # Merge every segment and the new entries into one
+        commands = list(self.commands)
+        embeddings = np.vstack([segment["embeddings"] for segment in self.segments]
+                               + [np.zeros((0, new_embeddings.shape[1]), dtype=np.float32)])
+        appended = []
+        for entry, embedding in zip(new_entries, new_embeddings):
+            i = rows.get(entry["id"])
+            if i is None:
+                commands.append(entry)
+                appended.append(embedding)
+            else:
+                commands[i] = entry
+                embeddings[i] = embedding
+        if appended:
+            embeddings = np.vstack([embeddings, np.array(appended)])
+        self._write_segment(segment_name, commands, embeddings)
+
+        index_name = None
+        if self.index_type == "ivf":
+            index_name = f"ivf-{generation}"
+            index = IVFIndex(embeddings.shape[1], nprobe=self.nprobe)
+            index.add(embeddings, np.arange(len(embeddings)))
+            index.merge()
+            index.save(os.path.join(self.path, index_name))
+        self._publish(generation, [segment_name], index_name, int(embeddings.shape[1]))
+
+    def count(self):
+        """Return the number of stored commands"""
+        self._load()
+        return len(self.commands)
+
+    def query(self, query_texts=None, query_embeddings=None, n_results=10, nprobe=None):
+        """
+        Find the nearest stored commands for each query.
+
+        Args:
+            query_texts (List[str], optional): Texts to embed and query
+            query_embeddings (List[List[float]], optional): Precomputed query embeddings
+            n_results (int): Number of results per query
+            nprobe (int, optional): IVF lists scanned per query, overrides the store default
+
+        Returns:
+            dict: ChromaDB-style result with ids, documents, metadatas and
+            distances (squared L2), each a list with one entry per query
+        """
+        self._load()
+        if query_embeddings is None:
+            query_embeddings = self.embedding_function(query_texts)
+        # Query vectors from a lazy handler that fell back to placeholder vectors need the matching store
+        if self._embedding_tag_changed():
+            self._follow_embedding_tag()
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if not self.commands:
+            for _ in range(len(queries)):
+                for key in results:
+                    results[key].append([])
+            return results
+
+        n_results = min(n_results, len(self.commands))
+        # Squared L2 distance, same metric as the ChromaDB default. The IVF index covers
+        # the first segment, the others are scanned exhaustively.
+        scanned = self.segments[1:] if self.index is not None else self.segments
+        first_scanned_row = len(self.commands) - sum(len(segment["commands"]) for segment in scanned)
+        distances = np.zeros((len(queries), 0), dtype=np.float32)
+        if scanned:
+            distances = (np.sum(queries ** 2, axis=1)[:, None]
+                         + np.hstack([segment["norms"][None, :] - 2.0 * queries @ segment["embeddings"].T
+                                      for segment in scanned]))
+        scanned_rows = np.arange(first_scanned_row, len(self.commands))
+        if self.index is not None:
+            index_distances, index_rows = self.index.search(queries, n_results, nprobe)
+
+        for q, row in enumerate(distances):
+            candidates = scanned_rows
+            if self.index is not None:
+                row = np.concatenate([index_distances[q], row])
+                candidates = np.concatenate([index_rows[q], scanned_rows])
+            top = min(n_results, len(candidates))
+            nearest = np.argpartition(row, top - 1)[:top]
+            nearest = nearest[np.argsort(row[nearest])]
+            results["ids"].append([self.commands[i]["id"] for i in candidates[nearest]])
+            results["documents"].append([self.commands[i]["document"] for i in candidates[nearest]])
+            results["metadatas"].append([self.commands[i]["metadata"] for i in candidates[nearest]])
+            results["distances"].append([float(distance) for distance in row[nearest]])
+        return results
@@ -1,27 +1,131 @@
 import os
 import numpy as np
-import onnxruntime as ort
-from tokenizers import Tokenizer
 from typing import List, Union
-import requests
 import sys
 import random
+import re
+from collections import OrderedDict
+
+DEFAULT_BACKEND = "all-MiniLM-L6-v2"
+
+# Embedding backends selectable by name (VoskService(embedding_backend=...) or EMBEDDING_BACKEND)
+EMBEDDING_BACKENDS = {
+    # Current default, 6 layers
+    "all-MiniLM-L6-v2": {
+        "type": "onnx",
+        "url": "https://huggingface.co/onnx-models/all-MiniLM-L6-v2-onnx/resolve/main/model.onnx",
+        "tokenizer": "sentence-transformers/all-MiniLM-L6-v2",
+        "dimension": 384,
+        "max_seq_length": 128,
+        "pooling": "mean"
+    },
+    # 3 layers, roughly twice as fast as L6
+    "paraphrase-MiniLM-L3-v2": {
+        "type": "onnx",
+        "url": "https://huggingface.co/sentence-transformers/paraphrase-MiniLM-L3-v2/resolve/main/onnx/model.onnx",
+        "tokenizer": "sentence-transformers/paraphrase-MiniLM-L3-v2",
+        "dimension": 384,
+        "max_seq_length": 128,
+        "pooling": "mean"
+    },
+    # 3 layers with a narrow hidden size, the smallest transformer option. BGE models
+    # are trained with the [CLS] token as the sentence embedding.
+    "bge-micro-v2": {
+        "type": "onnx",
+        "url": "https://huggingface.co/TaylorAI/bge-micro-v2/resolve/main/onnx/model.onnx",
+        "tokenizer": "TaylorAI/bge-micro-v2",
+        "dimension": 384,
+        "max_seq_length": 128,
+        "pooling": "cls"
+    },
+    # Averaged static word vectors (GloVe text format), no transformer at all
+    "static-glove-50d": {
+        "type": "static",
+        "vectors": "glove.6B.50d.txt",
+        "dimension": 50,
+        "pooling": "mean"
+    }
+}
+
+def embedding_tag(model_name: str, dimension: int, pooling: str = "mean", using_dummy: bool = False) -> str:
+    """
+    Tag for vectors cached outside the handler (e.g. in CommandStore), so backends never mix.
+    
+    Args:
+        model_name (str): Backend name in EMBEDDING_BACKENDS
+        dimension (int): Embedding dimension
+        pooling (str): Pooling the backend uses by default, only tagged when it is not 'mean'
+        using_dummy (bool): The handler fell back to random placeholder vectors
+        
+    Returns:
+        str: e.g. 'all-MiniLM-L6-v2:384', 'bge-micro-v2:384:cls' or 'all-MiniLM-L6-v2:384:dummy'
+    """
+    tag = f"{model_name}:{dimension}"
+    if pooling != "mean":
+        tag += f":{pooling}"
+    if using_dummy:
+        tag += ":dummy"
+    return tag
+
+def create_embedding_handler(backend: str = None, model_dir: str = "onnx-models", num_threads: int = None,
+                             lazy: bool = None):
+    """
+    Create the embedding handler for a registered backend.
+    
+    Args:
+        backend (str, optional): Name in EMBEDDING_BACKENDS. Defaults to the
+            EMBEDDING_BACKEND environment variable, then DEFAULT_BACKEND.
+        model_dir (str): Directory to store/load model files
+        num_threads (int, optional): ONNX Runtime thread count, see ONNXEmbeddingHandler
+        lazy (bool, optional): Defer importing ONNX Runtime and loading a transformer backend
+            until the first text is embedded. Defaults to EMBEDDING_LAZY=1 in the environment.
+        
+    Returns:
+        ONNXEmbeddingHandler, LazyEmbeddingHandler or StaticEmbeddingHandler
+    """
+    backend = backend or os.environ.get("EMBEDDING_BACKEND") or DEFAULT_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', choose one of {sorted(EMBEDDING_BACKENDS)}")
+    if lazy is None:
+        lazy = os.environ.get("EMBEDDING_LAZY") == "1"
+    
+    if EMBEDDING_BACKENDS[backend]["type"] == "static":
+        return StaticEmbeddingHandler(model_dir, backend)
+    if lazy:
+        return LazyEmbeddingHandler(model_dir, backend, num_threads)
+    return ONNXEmbeddingHandler(model_dir, backend, num_threads)
 
 class ONNXEmbeddingHandler:
-    def __init__(self, model_dir: str = "onnx-models"):
+    def __init__(self, model_dir: str = "onnx-models", model_name: str = DEFAULT_BACKEND, num_threads: int = None):
         """
-        Initialize the ONNX embedding handler for all-MiniLM-L6-v2.
+        Initialize the ONNX embedding handler for a sentence encoder, all-MiniLM-L6-v2 by default.
         
         Args:
             model_dir (str): Directory to store/load the ONNX model
+            model_name (str): ONNX backend name in EMBEDDING_BACKENDS
+            num_threads (int, optional): Intra/inter-op thread count for ONNX Runtime. Use 1 when the
+                handler is created before forking, so no thread pool exists in the parent. Defaults to ORT's choice.
         """
+        config = EMBEDDING_BACKENDS[model_name]
         self.model_dir = model_dir
-        self.model_name = "all-MiniLM-L6-v2"
+        self.model_name = model_name
         self.model_path = os.path.join(model_dir, f"{self.model_name}-onnx/model.onnx")
-        self.embedding_dim = 384   # Default embedding dimension for all-MiniLM-L6-v2
-        self.max_seq_length = 128  # Default max sequence length for all-MiniLM-L6-v2
+        self.model_url = config["url"]
+        self.tokenizer_name = config["tokenizer"]
+        self.embedding_dim = config["dimension"]
+        self.max_seq_length = config["max_seq_length"]
+        self.pooling = config["pooling"]
         self.using_dummy = False
         
+        # Fixed sequence-length buckets so ONNX Runtime sees a small set of
+        # input shapes and can reuse its allocations between calls
+        self.length_buckets = self._make_length_buckets(self.max_seq_length)
+        self._bucket_buffers = {}
+        
+        # Small LRU cache of token ids, voice commands repeat a lot
+        self.token_cache_size = 1024
+        self._token_cache = OrderedDict()
+        
         # Ensure model directory exists
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         
@@ -36,12 +140,23 @@ class ONNXEmbeddingHandler:
                     self._create_dummy_model()
                     self.using_dummy = True
                 
+            # Imported here so the static backend and lazy startup never load them
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+            
             # Initialize ONNX Runtime session
-            self.ort_session = ort.InferenceSession(self.model_path)
+            session_options = ort.SessionOptions()
+            if num_threads is not None:
+                session_options.intra_op_num_threads = num_threads
+                session_options.inter_op_num_threads = num_threads
+            self.ort_session = ort.InferenceSession(self.model_path, session_options)
+            # Not every exported encoder takes token_type_ids
+            self.input_names = {model_input.name for model_input in self.ort_session.get_inputs()}
             
             # Initialize tokenizer
             try:
-                self.tokenizer = Tokenizer.from_pretrained(f"sentence-transformers/{self.model_name}")
+                self.tokenizer = self._configure_tokenizer(Tokenizer.from_pretrained(self.tokenizer_name),
+                                                           self.max_seq_length)
             except Exception as tokenizer_error:
                 print(f"Error loading tokenizer: {str(tokenizer_error)}")
                 print("Falling back to dummy implementation")
@@ -52,12 +167,15 @@ class ONNXEmbeddingHandler:
             print("Falling back to dummy implementation")
             self.using_dummy = True
             self._create_dummy_model()
+        
+        # Cached vectors (e.g. in CommandStore) are tagged with this so backends never mix
+        self.embedding_tag = embedding_tag(self.model_name, self.embedding_dim, self.pooling, self.using_dummy)
 
     def _create_dummy_model(self):
         """Create a dummy model file for testing"""
         try:
             # Create a random array to simulate embeddings
-            dummy_embedding = np.random.rand(384).astype(np.float32)
+            dummy_embedding = np.random.rand(self.embedding_dim).astype(np.float32)
             
             # Save the array to file
             with open(self.model_path, 'wb') as f:
@@ -68,7 +186,7 @@ class ONNXEmbeddingHandler:
             
             # Create metadata file
             metadata = {
-                "dimension": 384,
+                "dimension": self.embedding_dim,
                 "dummy": True,
                 "created": "fallback_for_testing"
             }
@@ -85,10 +203,17 @@ class ONNXEmbeddingHandler:
     def _download_model(self):
         """Download the ONNX model from HuggingFace."""
         print(f"Downloading {self.model_name} ONNX model...")        
-        url = f"https://huggingface.co/onnx-models/{self.model_name}-onnx/resolve/main/model.onnx"
         
         try:
-            response = requests.get(url, stream=True, timeout=15)
+            # Optional: Docker images ship the model, see requirements-download.txt
+            import requests
+        except ImportError:
+            print(f"requests is not installed, place the model at {self.model_path} "
+                  f"or pip install -r requirements-download.txt")
+            raise
+        
+        try:
+            response = requests.get(self.model_url, stream=True, timeout=15)
             response.raise_for_status()
             
             with open(self.model_path, 'wb') as f:
@@ -134,18 +259,172 @@ class ONNXEmbeddingHandler:
                 'token_type_ids': np.zeros((1, 10), dtype=np.int64)
             }
 
-    def encode(self, texts: Union[str, List[str]], normalize: bool = True, pooling: str = 'mean') -> np.ndarray:
+    @staticmethod
+    def _configure_tokenizer(tokenizer, max_seq_length: int):
+        """
+        Turn off the padding a hub tokenizer.json may enable and truncate to max_seq_length.
+        
+        Texts are padded to their length bucket by _tokenize_batch, so the tokenizer
+        must return only real tokens.
+        
+        Args:
+            tokenizer (tokenizers.Tokenizer): Loaded tokenizer
+            max_seq_length (int): Longest sequence the model accepts, special tokens included
+            
+        Returns:
+            tokenizers.Tokenizer: The same tokenizer
+        """
+        tokenizer.no_padding()
+        tokenizer.enable_truncation(max_length=max_seq_length)
+        return tokenizer
+
+    @staticmethod
+    def _make_length_buckets(max_seq_length: int) -> List[int]:
+        """
+        Build the list of padded sequence lengths (8, 16, 32, ... up to max_seq_length).
+        
+        Args:
+            max_seq_length (int): Longest sequence the model accepts
+            
+        Returns:
+            List[int]: Increasing bucket lengths, the last one is always max_seq_length
+        """
+        buckets = []
+        length = 8
+        while length < max_seq_length:
+            buckets.append(length)
+            length *= 2
+        buckets.append(max_seq_length)
+        return buckets
+
+    def _bucket_for(self, length: int) -> int:
+        """Return the smallest bucket length that fits a sequence of the given length."""
+        for bucket in self.length_buckets:
+            if length <= bucket:
+                return bucket
+        return self.length_buckets[-1]
+
+    def _token_ids(self, text: str) -> List[int]:
+        """
+        Tokenize a single text to ids, truncated to max_seq_length, using the LRU cache.
+        
+        Args:
+            text (str): Input text to tokenize
+            
+        Returns:
+            List[int]: Token ids including special tokens
+        """
+        ids = self._token_cache.get(text)
+        if ids is not None:
+            self._token_cache.move_to_end(text)
+            return ids
+        
+        encoded = self.tokenizer.encode(text)
+        # Only attended tokens, in case the tokenizer pads anyway
+        ids = encoded.ids[:sum(encoded.attention_mask)]
+        if len(ids) > self.max_seq_length:
+            # Keep the trailing [SEP] token when truncating
+            ids = ids[:self.max_seq_length - 1] + ids[-1:]
+        
+        self._token_cache[text] = ids
+        if len(self._token_cache) > self.token_cache_size:
+            self._token_cache.popitem(last=False)
+        return ids
+
+    def _bucket_inputs(self, bucket: int, batch_size: int) -> dict:
+        """
+        Get preallocated, zeroed input arrays for a bucket.
+        
+        The arrays are kept between calls and only grow when a larger batch is
+        seen, so steady-state encoding does not allocate new input tensors.
+        
+        Args:
+            bucket (int): Padded sequence length
+            batch_size (int): Number of rows needed
+            
+        Returns:
+            dict: input_ids, attention_mask and token_type_ids views of shape (batch_size, bucket)
+        """
+        buffers = self._bucket_buffers.get(bucket)
+        if buffers is None or buffers['input_ids'].shape[0] < batch_size:
+            buffers = {
+                'input_ids': np.zeros((batch_size, bucket), dtype=np.int64),
+                'attention_mask': np.zeros((batch_size, bucket), dtype=np.int64),
+                'token_type_ids': np.zeros((batch_size, bucket), dtype=np.int64)
+            }
+            self._bucket_buffers[bucket] = buffers
+        
+        inputs = {name: array[:batch_size] for name, array in buffers.items()}
+        inputs['input_ids'].fill(0)
+        inputs['attention_mask'].fill(0)
+        return inputs
+
+    def _tokenize_batch(self, texts: List[str]) -> List[tuple]:
+        """
+        Tokenize texts and group them into fixed-length padded buckets.
+        
+        Args:
+            texts (List[str]): Input texts to tokenize
+            
+        Returns:
+            List[tuple]: (row_indices, inputs) per bucket, where row_indices are the
+            positions of the texts in the original list
+        """
+        token_ids = [self._token_ids(text) for text in texts]
+        
+        groups = {}
+        for index, ids in enumerate(token_ids):
+            groups.setdefault(self._bucket_for(len(ids)), []).append(index)
+        
+        batches = []
+        for bucket, indices in sorted(groups.items()):
+            inputs = self._bucket_inputs(bucket, len(indices))
+            for row, index in enumerate(indices):
+                ids = token_ids[index]
+                inputs['input_ids'][row, :len(ids)] = ids
+                inputs['attention_mask'][row, :len(ids)] = 1
+            batches.append((indices, inputs))
+        return batches
+
+    @staticmethod
+    def _pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, pooling: str) -> np.ndarray:
+        """
+        Pool token embeddings into sentence embeddings, ignoring padding tokens.
+        
+        Args:
+            token_embeddings (np.ndarray): Shape (batch, sequence_length, embedding_dim)
+            attention_mask (np.ndarray): Shape (batch, sequence_length)
+            pooling (str): Pooling strategy ('mean', 'max', or 'cls')
+            
+        Returns:
+            np.ndarray: Shape (batch, embedding_dim)
+        """
+        if pooling == 'cls':
+            return token_embeddings[:, 0]
+        
+        mask = attention_mask[:, :, None].astype(token_embeddings.dtype)
+        if pooling == 'max':
+            masked = np.where(mask > 0, token_embeddings, -np.inf)
+            return np.maximum(masked.max(axis=1), 0.0)
+        
+        # Default to mean pooling
+        counts = np.maximum(mask.sum(axis=1), 1.0)
+        return (token_embeddings * mask).sum(axis=1) / counts
+
+    def encode(self, texts: Union[str, List[str]], normalize: bool = True, pooling: str = None) -> np.ndarray:
         """
         Generate embeddings for input texts.
         
         Args:
             texts (Union[str, List[str]]): Input text or list of texts
             normalize (bool): Whether to L2-normalize the embeddings
-            pooling (str): Pooling strategy ('mean', 'max', or 'cls')
+            pooling (str, optional): Pooling strategy ('mean', 'max', or 'cls'). Defaults to
+                the one the backend was trained with.
             
         Returns:
             np.ndarray: Array of embeddings, shape (n_texts, embedding_dim)
         """
+        pooling = pooling or self.pooling
         # Convert single text to list
         if isinstance(texts, str):
             texts = [texts]
@@ -153,9 +432,9 @@ class ONNXEmbeddingHandler:
         # If using dummy implementation, return random embeddings
         if self.using_dummy:
             embeddings = []
-            for _ in range(len(texts)):
+            for text in texts:
                 # Create deterministic embeddings based on the text
-                text_seed = sum(ord(c) for c in str(texts))
+                text_seed = sum(ord(c) for c in text)
                 random.seed(text_seed)
                 emb = np.array([random.random() for _ in range(self.embedding_dim)])
                 if normalize:
@@ -163,55 +442,44 @@ class ONNXEmbeddingHandler:
                 embeddings.append(emb)
             return np.array(embeddings)
             
-        # Use real ONNX model
-        embeddings = []
-        for text in texts:
+        # Use real ONNX model, one inference call per length bucket
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        try:
+            batches = self._tokenize_batch(texts)
+        except Exception as e:
+            print(f"Error in tokenization: {str(e)}")
+            batches = []
+            
+        failed = set(range(len(texts)))
+        for indices, tokens in batches:
             try:
-                # Tokenize
-                tokens = self._tokenize(text)
-                
                 # Run inference
-                ort_outputs = self.ort_session.run(None, tokens)
-                token_embeddings = ort_outputs[0][0]  # Shape [sequence_length, embedding_dim]
-                
-                # Apply pooling to get sentence embedding
-                attention_mask = tokens['attention_mask'][0]
+                ort_outputs = self.ort_session.run(
+                    None, {name: array for name, array in tokens.items() if name in self.input_names})
+                token_embeddings = ort_outputs[0]  # Shape [batch, bucket_length, embedding_dim]
                 
-                if pooling == 'cls':
-                    # Use CLS token embedding (first token)
-                    embedding = token_embeddings[0]
-                elif pooling == 'max':
-                    # Apply max pooling
-                    embedding = np.zeros(self.embedding_dim)
-                    for i in range(token_embeddings.shape[0]):
-                        if attention_mask[i] == 1:  # Only consider non-padding tokens
-                            embedding = np.maximum(embedding, token_embeddings[i])
-                else:  # Default to mean pooling
-                    # Apply mean pooling
-                    embedding = np.zeros(self.embedding_dim)
-                    valid_tokens = 0
-                    for i in range(token_embeddings.shape[0]):
-                        if attention_mask[i] == 1:  # Only consider non-padding tokens
-                            embedding += token_embeddings[i]
-                            valid_tokens += 1
-                    if valid_tokens > 0:
-                        embedding = embedding / valid_tokens
+                # Apply pooling to get sentence embeddings
+                pooled = self._pool(token_embeddings, tokens['attention_mask'], pooling)
                 
                 # Normalize if requested
                 if normalize:
-                    embedding = embedding / np.linalg.norm(embedding)
+                    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+                    pooled = pooled / np.maximum(norms, 1e-12)
                     
-                embeddings.append(embedding)
+                embeddings[indices] = pooled
+                failed.difference_update(indices)
             except Exception as e:
                 print(f"Error generating embedding for text: {str(e)}")
-                # Generate a fallback embedding
-                random.seed(sum(ord(c) for c in text))
-                embedding = np.array([random.random() for _ in range(self.embedding_dim)])
-                if normalize:
-                    embedding = embedding / np.linalg.norm(embedding)
-                embeddings.append(embedding)
+        
+        for index in sorted(failed):
+            # Generate a fallback embedding
+            random.seed(sum(ord(c) for c in texts[index]))
+            embedding = np.array([random.random() for _ in range(self.embedding_dim)])
+            if normalize:
+                embedding = embedding / np.linalg.norm(embedding)
+            embeddings[index] = embedding
             
-        return np.array(embeddings)
+        return embeddings
 
     # This class is directly used as the embedding function for ChromaDB
     def __call__(self, input: List[str]) -> List[List[float]]:
@@ -236,6 +504,158 @@ class ONNXEmbeddingHandler:
         """
         return self
 
+class LazyEmbeddingHandler:
+    def __init__(self, model_dir: str = "onnx-models", model_name: str = DEFAULT_BACKEND, num_threads: int = None):
+        """
+        Stand-in for ONNXEmbeddingHandler that creates it on first use.
+        
+        Name, dimension and tag come from EMBEDDING_BACKENDS, so a CommandStore can
+        be opened and already embedded commands reused without importing ONNX Runtime
+        or the tokenizer. The first text to embed (usually the first recognized
+        utterance) pays for loading the model.
+        
+        Args:
+            model_dir (str): Directory to store/load the ONNX model
+            model_name (str): ONNX backend name in EMBEDDING_BACKENDS
+            num_threads (int, optional): See ONNXEmbeddingHandler
+        """
+        self.model_dir = model_dir
+        self.model_name = model_name
+        self.num_threads = num_threads
+        self.embedding_dim = EMBEDDING_BACKENDS[model_name]["dimension"]
+        self.pooling = EMBEDDING_BACKENDS[model_name]["pooling"]
+        self.handler = None
+    
+    @property
+    def embedding_tag(self) -> str:
+        """Tag of the backend, or of the loaded handler, which differs if it fell back to dummy vectors"""
+        if self.handler is not None:
+            return self.handler.embedding_tag
+        return embedding_tag(self.model_name, self.embedding_dim, self.pooling)
+    
+    def load(self) -> ONNXEmbeddingHandler:
+        """Create the real handler if that has not happened yet and return it"""
+        if self.handler is None:
+            self.handler = ONNXEmbeddingHandler(self.model_dir, self.model_name, self.num_threads)
+        return self.handler
+    
+    def __getattr__(self, name):
+        # Everything not known up front (encode, using_dummy, ...) needs the model
+        if name == "handler":
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self.load()(input)
+    
+    def get_embedding_function(self):
+        """Returns this handler as a ChromaDB embedding function, without loading the model."""
+        return self
+
+class StaticEmbeddingHandler:
+    def __init__(self, model_dir: str = "onnx-models", model_name: str = "static-glove-50d"):
+        """
+        Initialize a bag-of-words embedding handler over static word vectors.
+        
+        A sentence embedding is the mean of its word vectors, so encoding is a
+        dictionary lookup and an average - no transformer, suitable for tiny devices.
+        The vectors are read from a GloVe-format text file once and cached as
+        vocab.txt + vectors.npy, which are memory-mapped on later starts.
+        
+        Args:
+            model_dir (str): Directory to store/load the word vectors
+            model_name (str): Static backend name in EMBEDDING_BACKENDS
+        """
+        config = EMBEDDING_BACKENDS[model_name]
+        self.model_dir = model_dir
+        self.model_name = model_name
+        self.vectors_dir = os.path.join(model_dir, model_name)
+        self.embedding_dim = config["dimension"]
+        self.pooling = config["pooling"]
+        self.using_dummy = False
+        self.vocab = {}
+        self.vectors = None
+        
+        os.makedirs(self.vectors_dir, exist_ok=True)
+        
+        try:
+            self._load_vectors(os.path.join(self.vectors_dir, config["vectors"]))
+            self.embedding_dim = self.vectors.shape[1]
+        except Exception as e:
+            print(f"Error loading word vectors: {str(e)}")
+            print("Falling back to dummy implementation")
+            self.using_dummy = True
+        
+        # Cached vectors (e.g. in CommandStore) are tagged with this so backends never mix
+        self.embedding_tag = embedding_tag(self.model_name, self.embedding_dim, self.pooling, self.using_dummy)
+
+    def _load_vectors(self, text_path: str):
+        """Load cached vectors, converting the GloVe text file on first use"""
+        vocab_path = os.path.join(self.vectors_dir, "vocab.txt")
+        npy_path = os.path.join(self.vectors_dir, "vectors.npy")
+        
+        if not os.path.exists(npy_path):
+            print(f"Converting {text_path} to {npy_path}...")
+            words = []
+            vectors = []
+            with open(text_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip().split(" ")
+                    words.append(parts[0])
+                    vectors.append(np.asarray(parts[1:], dtype=np.float32))
+            np.save(npy_path, np.vstack(vectors))
+            with open(vocab_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(words))
+        
+        with open(vocab_path, encoding="utf-8") as f:
+            self.vocab = {word: i for i, word in enumerate(f.read().split("\n"))}
+        self.vectors = np.load(npy_path, mmap_mode='r')
+
+    def encode(self, texts: Union[str, List[str]], normalize: bool = True, pooling: str = None) -> np.ndarray:
+        """
+        Generate embeddings for input texts.
+        
+        Args:
+            texts (Union[str, List[str]]): Input text or list of texts
+            normalize (bool): Whether to L2-normalize the embeddings
+            pooling (str, optional): Pooling strategy ('mean' or 'max'), 'cls' falls back to 'mean'.
+                Defaults to the backend's pooling.
+            
+        Returns:
+            np.ndarray: Array of embeddings, shape (n_texts, embedding_dim)
+        """
+        pooling = pooling or self.pooling
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            if self.using_dummy:
+                rows = []
+            else:
+                rows = [self.vocab[word] for word in re.findall(r"[a-z0-9']+", text.lower()) if word in self.vocab]
+            
+            if rows:
+                word_vectors = self.vectors[rows]
+                embeddings[i] = word_vectors.max(axis=0) if pooling == 'max' else word_vectors.mean(axis=0)
+            else:
+                # No known words, use a deterministic fallback embedding like the ONNX handler
+                random.seed(sum(ord(c) for c in text))
+                embeddings[i] = [random.random() for _ in range(self.embedding_dim)]
+            
+            if normalize:
+                embeddings[i] /= max(np.linalg.norm(embeddings[i]), 1e-12)
+        return embeddings
+
+    # This class is directly used as the embedding function for ChromaDB
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """ChromaDB-compatible embedding function."""
+        return self.encode(input).tolist()
+        
+    def get_embedding_function(self):
+        """Returns this handler as a ChromaDB embedding function."""
+        return self
+
 if __name__ == "__main__":
     # Example usage
     handler = ONNXEmbeddingHandler()
@@ -0,0 +1,107 @@
+class Endpointer:
+    def __init__(self, samplerate, trailing_silence_ms=None, max_utterance_ms=None):
+        """
+        Track utterance boundaries on top of the Vosk recognizer.
+
+        Vosk decides on its own when an utterance ends. This class adds a
+        configurable trailing-silence timeout and a maximum utterance length,
+        both measured in audio samples fed to the recognizer, and records the
+        sample offsets of each utterance.
+
+        Args:
+            samplerate (int): Sample rate of the audio fed to the recognizer
+            trailing_silence_ms (int, optional): Finalize once the last recognized word
+                ended this long ago. If None, only Vosk's own endpointer is used.
+            max_utterance_ms (int, optional): Finalize once an utterance has lasted this long
+        """
+        self.samplerate = samplerate
+        self.trailing_silence_ms = trailing_silence_ms
+        self.max_utterance_ms = max_utterance_ms
+        self.samples_fed = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the current utterance, keeping the stream position"""
+        self.utterance_start = None
+        self.last_word_end = None
+        self.last_partial = ""
+        self.last_change = self.samples_fed
+
+    def _ms_to_samples(self, ms):
+        return int(ms * self.samplerate / 1000)
+
+    def _sample_at(self, seconds):
+        return int(round(seconds * self.samplerate))
+
+    def advance(self, num_samples):
+        """Account for audio that was just fed to the recognizer"""
+        self.samples_fed += num_samples
+
+    def update_partial(self, partial):
+        """
+        Update the utterance state from a Vosk partial result.
+
+        Args:
+            partial (dict): Parsed PartialResult(), with 'partial_result' word
+                timings when SetPartialWords is enabled
+
+        Returns:
+            str: 'silence' or 'max_length' if the utterance should be finalized now, else None
+        """
+        text = partial.get("partial", "").strip()
+        if not text:
+            return None
+
+        words = partial.get("partial_result")
+        if words:
+            self.utterance_start = self._sample_at(words[0]["start"])
+            self.last_word_end = self._sample_at(words[-1]["end"])
+        elif self.utterance_start is None:
+            self.utterance_start = self.samples_fed
+
+        if text != self.last_partial:
+            self.last_partial = text
+            self.last_change = self.samples_fed
+
+        if self.trailing_silence_ms is not None:
+            # Without word timings, fall back to when the partial text last changed
+            speech_end = self.last_word_end if self.last_word_end is not None else self.last_change
+            if self.samples_fed - speech_end >= self._ms_to_samples(self.trailing_silence_ms):
+                return "silence"
+
+        if self.max_utterance_ms is not None:
+            if self.samples_fed - self.utterance_start >= self._ms_to_samples(self.max_utterance_ms):
+                return "max_length"
+
+        return None
+
+    def annotate(self, result, endpoint, decode_seconds):
+        """
+        Add timing information to a final result and start a new utterance.
+
+        Args:
+            result (dict): Parsed Result() or FinalResult()
+            endpoint (str): What ended the utterance ('vosk', 'silence', 'max_length' or 'forced')
+            decode_seconds (float): Wall-clock time spent in the recognizer call
+
+        Returns:
+            dict: The same result with start_sample, end_sample, endpoint,
+            endpoint_latency_ms and decode_latency_ms added
+        """
+        words = result.get("result")
+        if words:
+            start_sample = self._sample_at(words[0]["start"])
+            end_sample = self._sample_at(words[-1]["end"])
+        else:
+            start_sample = self.utterance_start if self.utterance_start is not None else self.samples_fed
+            end_sample = self.last_word_end if self.last_word_end is not None else self.samples_fed
+
+        result["start_sample"] = start_sample
+        result["end_sample"] = end_sample
+        result["endpoint"] = endpoint
+        # Audio that arrived after the speech ended before the result was produced
+        result["endpoint_latency_ms"] = max(0, self.samples_fed - end_sample) * 1000.0 / self.samplerate
+        result["decode_latency_ms"] = decode_seconds * 1000.0
+
+        self.reset()
+        return result
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOGGER_NAME = "voice_command"
+
+_listener = None
+_queue_handler = None
+
+class JSONLFormatter(logging.Formatter):
+    def format(self, record):
+        """Format a record as one JSON object with its event name and structured fields"""
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, events, min_interval):
+        """
+        Drop records of the given events that arrive less than min_interval seconds apart.
+
+        Args:
+            events (set): Event names to rate-limit, e.g. {'partial'}
+            min_interval (float): Minimum seconds between two records of the same event
+        """
+        super().__init__()
+        self.events = events
+        self.min_interval = min_interval
+        self.last_emitted = {}
+
+    def filter(self, record):
+        event = getattr(record, "event", None)
+        if event not in self.events:
+            return True
+        now = time.monotonic()
+        if now - self.last_emitted.get(event, float("-inf")) < self.min_interval:
+            return False
+        self.last_emitted[event] = now
+        return True
+
+def stop_logging():
+    """Flush and stop the background writer thread, if one is running. Also runs at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _restart_listener_in_child():
+    """The listener thread does not survive os.fork(), start a new one in the child"""
+    global _listener
+    if _listener is None:
+        return
+    # Records still queued belong to the parent, which writes them itself
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *_listener.handlers)
+    _listener.start()
+    _queue_handler.queue = log_queue
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+def setup_logging(level=None, jsonl_path=None, partial_interval=None):
+    """
+    Route the service's event log through a queue to a background writer thread.
+
+    The audio thread only puts records on an in-memory queue; console and file
+    writes happen on the listener thread. Partial results are rate-limited
+    before they are even queued, and messages are only formatted once they
+    pass. Modules only get the logger, entry points call this once, so importing
+    the service starts no thread. A process forked after this (e.g. a prefork
+    worker) gets its own queue and listener thread.
+
+    Args:
+        level (str, optional): Log level. Defaults to LOG_LEVEL or INFO.
+        jsonl_path (str, optional): Also write every event as JSON lines to this file. Defaults to LOG_JSONL.
+        partial_interval (float, optional): Minimum seconds between logged partial results.
+            Defaults to LOG_PARTIAL_INTERVAL or 0.5.
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    global _listener, _queue_handler
+    level = level or os.environ.get("LOG_LEVEL", "INFO")
+    jsonl_path = jsonl_path or os.environ.get("LOG_JSONL")
+    if partial_interval is None:
+        partial_interval = float(os.environ.get("LOG_PARTIAL_INTERVAL", 0.5))
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers = [console]
+    if jsonl_path:
+        jsonl = logging.FileHandler(jsonl_path)
+        jsonl.setFormatter(JSONLFormatter())
+        handlers.append(jsonl)
+
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter({"partial"}, partial_interval))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers = [_queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+def log_event(logger, level, event, message, *args, **fields):
+    """
+    Log a structured event.
+
+    Args:
+        logger (logging.Logger): logging.getLogger(LOGGER_NAME)
+        level (int): logging level, e.g. logging.INFO
+        event (str): Event name, e.g. 'partial', 'result', 'match'
+        message (str): Human-readable message for the console, with %-style placeholders for args
+        *args: Message arguments, only formatted if the record is emitted
+        **fields: Structured fields for the JSONL output
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={"event": event, "fields": fields})
@@ -0,0 +1,234 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from event_log import LOGGER_NAME, log_event
+
+logger = logging.getLogger(LOGGER_NAME)
+
+def model_size_mb(path):
+    """Size of a model directory on disk, used as the estimate of its memory footprint"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total / (1024 * 1024)
+
+def load_vosk_model(path):
+    """Default loader, imports vosk only when the first model is loaded"""
+    from vosk import Model
+    return Model(path)
+
+class ModelPool:
+    def __init__(self, models=None, memory_budget_mb=None, loader=load_vosk_model, size_fn=model_size_mb):
+        """
+        Load Vosk models lazily by key and share them between recognizers.
+
+        Models are kept in least-recently-used order. Before each load, the least
+        recently used models are evicted until the estimated total plus the new
+        model fits the memory budget, so peak memory stays within it. Models a
+        service is using are pinned (see pin()) and never evicted, so they stay
+        counted against the budget for as long as they are resident. If pinned
+        models alone exceed the budget, the load goes ahead over budget.
+
+        Args:
+            models (dict, optional): Key (e.g. 'en', 'de', 'en-large') to model directory
+            memory_budget_mb (float, optional): Budget for all loaded models. Defaults to
+                MODEL_POOL_BUDGET_MB, unlimited if that is not set either.
+            loader (Callable): Loads a model from its path. Defaults to vosk.Model.
+            size_fn (Callable): Estimates a model's memory footprint in MB from its path.
+                Defaults to its size on disk.
+        """
+        if memory_budget_mb is None and os.environ.get("MODEL_POOL_BUDGET_MB"):
+            memory_budget_mb = float(os.environ["MODEL_POOL_BUDGET_MB"])
+        self.paths = dict(models or {})
+        self.memory_budget_mb = memory_budget_mb
+        self.loader = loader
+        self.size_fn = size_fn
+        self.models = OrderedDict()  # key -> (model, size_mb), least recently used first
+        self.loading = {}  # key -> threading.Event set when its load finished
+        self.reserved = {}  # key -> estimated MB of a model being loaded
+        self.pins = {}  # key -> number of services using the model
+        self.failed = {}  # key -> error of its last load, if that failed
+        self.lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, value=None, memory_budget_mb=None):
+        """
+        Create a pool from a 'key=path,key=path' string, e.g. VOSK_MODELS.
+
+        Args:
+            value (str, optional): Model list. Defaults to the VOSK_MODELS environment variable.
+            memory_budget_mb (float, optional): See ModelPool
+
+        Returns:
+            ModelPool
+        """
+        value = value if value is not None else os.environ.get("VOSK_MODELS", "")
+        models = {}
+        for entry in value.split(","):
+            if entry.strip():
+                key, path = entry.split("=", 1)
+                models[key.strip()] = path.strip()
+        return cls(models, memory_budget_mb)
+
+    def register(self, key, path):
+        """Add or replace a model path; a loaded model of the same key is kept until evicted"""
+        with self.lock:
+            self.paths[key] = path
+
+    def get(self, key):
+        """
+        Return the model for a key, loading it if needed.
+
+        Concurrent requests for the same key wait for a single load.
+
+        Args:
+            key (str): Registered model key
+
+        Returns:
+            vosk.Model: The shared model
+        """
+        if key not in self.paths:
+            raise KeyError(f"Unknown model '{key}', choose one of {sorted(self.paths)}")
+        while True:
+            with self.lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    return self.models[key][0]
+                done = self.loading.get(key)
+                if done is None:
+                    done = self.loading[key] = threading.Event()
+                    self.failed.pop(key, None)
+                    path = self.paths[key]
+                    break
+            # Another thread is loading this model
+            done.wait()
+
+        try:
+            # Make room first, so the old models and the new one are never resident together
+            size_mb = self.size_fn(path)
+            with self.lock:
+                evicted = self._evict(size_mb)
+                self.reserved[key] = size_mb
+            for evicted_key in evicted:
+                log_event(logger, logging.INFO, "model_evicted", f"Evicted model '{evicted_key}' to stay within "
+                          f"{self.memory_budget_mb:.0f} MB", model=evicted_key)
+
+            start = time.perf_counter()
+            model = self.loader(path)
+            load_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self.models[key] = (model, size_mb)
+                self.loads += 1
+        except Exception as e:
+            with self.lock:
+                self.failed[key] = str(e)
+            raise
+        finally:
+            with self.lock:
+                del self.loading[key]
+                self.reserved.pop(key, None)
+            done.set()
+
+        log_event(logger, logging.INFO, "model_loaded", f"Loaded model '{key}' in {load_ms:.0f} ms ({size_mb:.0f} MB)",
+                  model=key, load_ms=load_ms, size_mb=size_mb)
+        return model
+
+    def get_if_loaded(self, key):
+        """Return the model for a key if it is already loaded, else None. Never blocks on a load."""
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                return self.models[key][0]
+        return None
+
+    def is_loading(self, key):
+        """Return True while a model is being loaded"""
+        with self.lock:
+            return key in self.loading
+
+    def load_error(self, key):
+        """Return the error of a model's last load if it failed (and no new load started since), else None"""
+        with self.lock:
+            return self.failed.get(key)
+
+    def prewarm(self, *keys):
+        """
+        Load models in a background thread, e.g. the next language a user may switch to.
+
+        Args:
+            *keys (str): Model keys to load, in order
+
+        Returns:
+            threading.Thread: The loading thread
+        """
+        def load():
+            for key in keys:
+                try:
+                    self.get(key)
+                except Exception as e:
+                    log_event(logger, logging.ERROR, "model_load_failed", f"Loading model '{key}' failed: {str(e)}",
+                              model=key, error=str(e))
+        thread = threading.Thread(target=load, name="model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def pin(self, key):
+        """Mark a model as in use by a service, so it is never evicted. Pins are counted."""
+        with self.lock:
+            self.pins[key] = self.pins.get(key, 0) + 1
+
+    def unpin(self, key):
+        """Release one pin() of a model, it can be evicted again once no service uses it"""
+        with self.lock:
+            if self.pins.get(key, 0) <= 1:
+                self.pins.pop(key, None)
+            else:
+                self.pins[key] -= 1
+
+    def evict(self, key):
+        """Drop the pool's reference to a model that is not pinned"""
+        with self.lock:
+            if key not in self.pins:
+                self.models.pop(key, None)
+
+    def _evict(self, needed_mb):
+        """Evict least recently used, unpinned models until needed_mb more fits the budget. Called with the lock held."""
+        evicted = []
+        if self.memory_budget_mb is None:
+            return evicted
+        for key in list(self.models):
+            if self.loaded_mb() + needed_mb <= self.memory_budget_mb:
+                break
+            if key not in self.pins:
+                del self.models[key]
+                self.evictions += 1
+                evicted.append(key)
+        return evicted
+
+    def loaded_mb(self):
+        """Estimated memory of all loaded models and those being loaded, in MB"""
+        return (sum(size_mb for _, size_mb in self.models.values())
+                + sum(self.reserved.values()))
+
+    def stats(self):
+        """
+        Returns:
+            dict: loaded keys (least recently used first), loading keys, pinned keys,
+            failed keys, loaded_mb, memory_budget_mb, loads and evictions
+        """
+        with self.lock:
+            return {
+                "loaded": list(self.models),
+                "loading": list(self.loading),
+                "pinned": sorted(self.pins),
+                "failed": sorted(self.failed),
+                "loaded_mb": round(self.loaded_mb(), 1),
+                "memory_budget_mb": self.memory_budget_mb,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,119 @@
+import numpy as np
+
+METHODS = ("wiener", "spectral")
+
+class NoiseSuppressor:
+    def __init__(self, samplerate=16000, method="wiener", frame_ms=32, floor_db=-20.0,
+                 oversubtraction=1.5, speech_threshold_db=4.0, noise_smoothing=0.9, noise_rise_db_per_s=3.0):
+        """
+        Streaming single-channel noise suppression for int16 audio buffers.
+
+        Audio is split into half-overlapping sqrt-Hann frames, each frame's spectrum
+        is multiplied by a gain and the frames are overlap-added back. All frames
+        that complete within one buffer are transformed in one batched FFT. The
+        noise power spectrum is estimated from frames whose energy stays within
+        speech_threshold_db of the current estimate, i.e. during non-speech. While
+        speech is detected it may rise slowly, so a louder cabin (higher speed, fan on)
+        is picked up again.
+
+        Methods:
+            wiener:   gain = SNR / (1 + SNR), with SNR = max(P / N - 1, 0)
+            spectral: power spectral subtraction, gain = sqrt(1 - oversubtraction * N / P)
+
+        Output has exactly as many samples as the input and is delayed by
+        one frame (frame_ms).
+
+        Args:
+            samplerate (int): Sample rate of the audio
+            method (str): 'wiener' or 'spectral'
+            frame_ms (int): FFT frame length in milliseconds
+            floor_db (float): Lowest gain, limits musical noise and speech distortion
+            oversubtraction (float): Noise estimate multiplier of the spectral method
+            speech_threshold_db (float): Frames this much louder than the noise estimate count as speech
+            noise_smoothing (float): Weight of the old noise estimate when a noise frame updates it
+            noise_rise_db_per_s (float): How fast the noise estimate may grow during speech
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown noise suppression method '{method}', choose one of {METHODS}")
+        self.samplerate = samplerate
+        self.method = method
+        self.n_fft = 1 << int(np.ceil(np.log2(samplerate * frame_ms / 1000)))
+        self.hop = self.n_fft // 2
+        # sqrt-Hann analysis and synthesis windows sum to one at 50% overlap
+        self.window = np.sqrt(np.hanning(self.n_fft + 1)[:-1]).astype(np.float32)
+        self.floor = 10 ** (floor_db / 20)
+        self.oversubtraction = oversubtraction
+        self.speech_threshold = 10 ** (speech_threshold_db / 10)
+        self.noise_smoothing = noise_smoothing
+        self.noise_rise = 10 ** (noise_rise_db_per_s / 10 * self.hop / samplerate)
+        self.reset()
+
+    def reset(self):
+        """Forget buffered audio and the noise estimate"""
+        self.input = np.zeros(self.hop, dtype=np.float32)  # Second half of the last frame
+        self.tail = np.zeros(self.hop, dtype=np.float32)   # Overlap-add tail of the last frame
+        # Finished samples not returned yet. Starting with a hop of silence means a
+        # buffer of any length can always be answered with as many samples.
+        self.output = np.zeros(self.hop, dtype=np.float32)
+        self.noise_psd = None
+
+    def process(self, data):
+        """
+        Suppress noise in one buffer.
+
+        Args:
+            data (bytes): 16-bit mono audio
+
+        Returns:
+            bytes: Processed 16-bit mono audio of the same length
+        """
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        buffer = np.concatenate([self.input, samples])
+        n_frames = (len(buffer) - self.hop) // self.hop
+        if n_frames > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, self.n_fft)[::self.hop][:n_frames]
+            spectra = np.fft.rfft(frames * self.window, axis=1)
+            power = spectra.real ** 2 + spectra.imag ** 2
+
+            self._update_noise(power)
+            gains = self._gains(power)
+            frames = np.fft.irfft(spectra * gains, n=self.n_fft, axis=1).astype(np.float32) * self.window
+
+            # Each hop of output is this frame's first half plus the previous frame's second half
+            heads = frames[:, :self.hop]
+            heads[0] += self.tail
+            heads[1:] += frames[:-1, self.hop:]
+            self.tail = frames[-1, self.hop:].copy()
+            self.output = np.concatenate([self.output, heads.ravel()])
+            self.input = buffer[n_frames * self.hop:]
+        else:
+            self.input = buffer
+
+        out, self.output = self.output[:len(samples)], self.output[len(samples):]
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16).tobytes()
+
+    def _update_noise(self, power):
+        """Update the noise power spectrum from the non-speech frames of a batch"""
+        if self.noise_psd is None:
+            # Assume the stream starts without speech
+            self.noise_psd = np.maximum(power.mean(axis=0), 1e-3)
+            return
+        frame_energy = power.sum(axis=1)
+        noise_energy = self.noise_psd.sum()
+        is_noise = frame_energy < self.speech_threshold * noise_energy
+        n_noise = int(is_noise.sum())
+        if n_noise:
+            weight = self.noise_smoothing ** n_noise
+            self.noise_psd = weight * self.noise_psd + (1 - weight) * power[is_noise].mean(axis=0)
+        if n_noise < len(power):
+            self.noise_psd *= self.noise_rise ** (len(power) - n_noise)
+
+    def _gains(self, power):
+        """Per-bin gains for every frame of a batch"""
+        if self.method == "wiener":
+            snr = np.maximum(power / self.noise_psd - 1.0, 0.0)
+            gains = snr / (1.0 + snr)
+        else:
+            noise = self.noise_psd / np.maximum(power, 1e-10)
+            gains = np.sqrt(np.maximum(1.0 - self.oversubtraction * noise, 0.0))
+        return np.maximum(gains, self.floor).astype(np.float32)
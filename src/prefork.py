@@ -0,0 +1,210 @@
+import os
+import gc
+import sys
+import time
+import signal
+import tempfile
+
+def memory_usage(pid):
+    """
+    Read the memory usage of a process from /proc.
+
+    Args:
+        pid (int): Process id
+
+    Returns:
+        dict: rss_mb, pss_mb (shared pages split between sharers) and
+        uss_mb (pages only this process has, i.e. what it really costs)
+    """
+    usage = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                usage[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss_mb": usage.get("Rss", 0.0),
+        "pss_mb": usage.get("Pss", 0.0),
+        "uss_mb": usage.get("Private_Clean", 0.0) + usage.get("Private_Dirty", 0.0)
+    }
+
+def run_standalone_worker(service):
+    """Default worker body: listen on the worker's input device and publish actions"""
+    service.run_standalone()
+
+class PreforkLauncher:
+    def __init__(self, num_workers, model_path="/app/vosk-model-small-en-us", store_path=None,
+                 embedding_backend=None, zmq_base_port=5555, input_device_indices=None,
+                 worker_target=run_standalone_worker):
+        """
+        Load the Vosk model, embedding handler and command index once, then fork
+        recognition workers that share those pages copy-on-write.
+
+        Only read-mostly state is created in the parent. PyAudio, ZMQ sockets and
+        recognizers are created in each worker after the fork, since they are not
+        fork-safe. ONNX Runtime runs single-threaded so no thread pool exists at
+        fork time, and commands live in a memory-mapped CommandStore.
+
+        Args:
+            num_workers (int): Number of worker processes
+            model_path (str): Path to the Vosk model directory
+            store_path (str, optional): Persistent command store directory. Defaults to
+                COMMAND_STORE_PATH, then a temporary directory.
+            embedding_backend (str, optional): Embedding backend name
+            zmq_base_port (int): First worker port. Workers publish actions on consecutive
+                ports from here, skipping the orchestrator's control port (ZMQ_CONTROL_PORT, 5556).
+            input_device_indices (List[int], optional): Input device per worker
+            worker_target (Callable): Function run in each worker with its VoskService
+        """
+        self.num_workers = num_workers
+        self.model_path = model_path
+        self.store_path = store_path or os.environ.get("COMMAND_STORE_PATH")
+        self._store_dir = None
+        if not self.store_path:
+            # Removed again in stop()
+            self._store_dir = tempfile.TemporaryDirectory(prefix="commands-")
+            self.store_path = self._store_dir.name
+        self.embedding_backend = embedding_backend
+        self.zmq_base_port = zmq_base_port
+        self.zmq_ports = self._worker_ports(zmq_base_port, num_workers)
+        self.input_device_indices = input_device_indices or [None] * num_workers
+        self.worker_target = worker_target
+        self.workers = []
+        self.load_time = None
+        self.startup_time = None
+
+    @staticmethod
+    def _worker_ports(base_port, num_workers):
+        """Consecutive ports from base_port without the orchestrator's control port"""
+        control_port = int(os.environ.get("ZMQ_CONTROL_PORT", 5556))
+        ports = []
+        port = base_port
+        while len(ports) < num_workers:
+            if port != control_port:
+                ports.append(port)
+            port += 1
+        return ports
+
+    def load_shared(self):
+        """Load everything the workers share. Runs once, in the parent."""
+        # Tokenizers disables its thread pool after a fork anyway, avoid the warning
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        from vosk import Model
+        from embedding_handler import create_embedding_handler
+        from command_store import CommandStore, backend_store_path
+        # Import in the parent so workers do not pay the import time again
+        import vosk_service
+
+        self.model = Model(self.model_path)
+        # Never lazy: a handler loaded after the fork would be loaded once per worker
+        self.embedding_handler = create_embedding_handler(self.embedding_backend, num_threads=1, lazy=False)
+        # One encode in the parent, so the session's first-run allocations are shared too
+        self.embedding_handler.encode("warm up")
+        self.commands_collection = CommandStore(
+            backend_store_path(self.store_path, self.embedding_handler),
+            self.embedding_handler.get_embedding_function()
+        )
+
+    def start(self):
+        """
+        Load shared state and fork the workers.
+
+        Returns:
+            list: Worker process ids
+        """
+        start = time.perf_counter()
+        self.load_shared()
+        self.load_time = time.perf_counter() - start
+
+        # Move everything loaded so far out of the GC's reach, so collections in
+        # the workers do not write to (and thereby copy) the shared pages
+        gc.freeze()
+
+        ready_fds = []
+        for i in range(self.num_workers):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                self._run_worker(i, write_fd)
+            os.close(write_fd)
+            self.workers.append(pid)
+            ready_fds.append(read_fd)
+
+        # Each worker writes one byte once its VoskService is ready
+        for fd in ready_fds:
+            os.read(fd, 1)
+            os.close(fd)
+        self.startup_time = time.perf_counter() - start
+        gc.unfreeze()
+        print(f"{self.num_workers} workers ready in {self.startup_time * 1000:.0f} ms "
+              f"(shared load {self.load_time * 1000:.0f} ms)")
+        return self.workers
+
+    def _run_worker(self, index, ready_fd):
+        """Body of a forked worker, never returns"""
+        exit_code = 0
+        try:
+            from vosk_service import VoskService
+            service = VoskService(
+                input_device_index=self.input_device_indices[index],
+                zmq_port=self.zmq_ports[index],
+                model=self.model,
+                embedding_handler=self.embedding_handler,
+                commands_collection=self.commands_collection
+            )
+            os.write(ready_fd, b"1")
+            os.close(ready_fd)
+            self.worker_target(service)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(f"Worker {index} failed: {str(e)}")
+            exit_code = 1
+        finally:
+            # os._exit skips atexit, flush the log first
+            from event_log import stop_logging
+            stop_logging()
+            os._exit(exit_code)
+
+    def memory_report(self):
+        """Return memory_usage() for the parent and every worker"""
+        report = {"parent": memory_usage(os.getpid())}
+        for i, pid in enumerate(self.workers):
+            report[f"worker {i}"] = memory_usage(pid)
+        return report
+
+    def stop(self):
+        """Terminate and reap all workers, and remove the temporary command store if there is one"""
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self.workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers = []
+        if self._store_dir is not None:
+            self._store_dir.cleanup()
+            self._store_dir = None
+
+if __name__ == "__main__":
+    from event_log import setup_logging
+    # Forked workers get their own listener thread, see setup_logging()
+    setup_logging()
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+
+    launcher = PreforkLauncher(num_workers)
+    launcher.start()
+    for name, usage in launcher.memory_report().items():
+        print(f"{name}: RSS {usage['rss_mb']:.0f} MB, PSS {usage['pss_mb']:.0f} MB, unique {usage['uss_mb']:.0f} MB")
+    try:
+        for _ in launcher.workers:
+            os.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        launcher.stop()
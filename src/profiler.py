@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import collections
+
+class SamplingProfiler:
+    def __init__(self, output_dir=None, interval=0.005):
+        """
+        Sample the Python stacks of all threads of the running process on demand.
+
+        Nothing is installed until a capture starts: no trace or profile hooks,
+        no sampler thread. A capture runs in its own daemon thread that reads
+        sys._current_frames() every `interval` seconds, so the profiled threads
+        are only paused for the moment their stack is copied. Frames are labelled
+        with their qualified name, e.g. VoskService.process_audio or
+        ONNXEmbeddingHandler.encode, and every stack is rooted at its thread name.
+
+        Args:
+            output_dir (str, optional): Directory for captures. Defaults to PROFILE_DIR,
+                then the current directory.
+            interval (float): Seconds between samples
+        """
+        self.output_dir = output_dir or os.environ.get("PROFILE_DIR", ".")
+        self.interval = interval
+        self.thread = None
+        self.last_output = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=10.0, output_format="collapsed"):
+        """
+        Start a capture in the background.
+
+        Args:
+            duration (float): Seconds to sample
+            output_format (str): 'collapsed' (one 'frame;frame;frame count' line per stack,
+                for flamegraph.pl and speedscope) or 'speedscope' (JSON with sample timing)
+
+        Returns:
+            str: Path the capture will be written to, or None if a capture is already running
+        """
+        if output_format not in ("collapsed", "speedscope"):
+            raise ValueError(f"Unknown profile format '{output_format}', choose 'collapsed' or 'speedscope'")
+        if self.running:
+            return None
+        extension = "txt" if output_format == "collapsed" else "speedscope.json"
+        path = os.path.join(self.output_dir, f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{extension}")
+        self.thread = threading.Thread(target=self._capture, args=(duration, output_format, path),
+                                       name="profiler", daemon=True)
+        self.thread.start()
+        return path
+
+    def _capture(self, duration, output_format, path):
+        """Sampler thread body: collect stacks for `duration` seconds and write them"""
+        own_id = threading.get_ident()
+        labels = {}  # code object -> frame label
+        samples = []  # (thread name, stack tuple, weight in seconds)
+        start = last = time.perf_counter()
+        while last - start < duration:
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = self._label(frame)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.reverse()
+                samples.append((names.get(thread_id, f"thread-{thread_id}"), tuple(stack), now - last))
+            last = now
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            if output_format == "collapsed":
+                f.write(self._collapsed(samples))
+            else:
+                json.dump(self._speedscope(samples, last - start), f)
+        self.last_output = path
+        print(f"Profile of {len(samples)} stack samples written to {path}")
+
+    @staticmethod
+    def _label(frame):
+        """Frame label 'Class.method (file.py:line)', computed once per code object"""
+        code = frame.f_code
+        name = getattr(code, "co_qualname", None)
+        if name is None:
+            # co_qualname is new in Python 3.11, before that the class comes from the first argument
+            name = code.co_name
+            if code.co_argcount and code.co_varnames[0] in ("self", "cls"):
+                owner = frame.f_locals.get(code.co_varnames[0])
+                if owner is not None:
+                    owner = owner if isinstance(owner, type) else type(owner)
+                    name = f"{owner.__qualname__}.{name}"
+        return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _collapsed(self, samples):
+        """Brendan Gregg's collapsed stack format, with counts in samples"""
+        counts = collections.Counter((thread_name,) + stack for thread_name, stack, _ in samples)
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common())
+
+    def _speedscope(self, samples, duration):
+        """speedscope's sampled profile format, one profile per thread"""
+        frames, frame_index = [], {}
+        profiles = {}
+        for thread_name, stack, weight in samples:
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            profile = profiles.setdefault(thread_name, {
+                "type": "sampled", "name": thread_name, "unit": "seconds",
+                "startValue": 0, "endValue": duration, "samples": [], "weights": []
+            })
+            profile["samples"].append(indices)
+            profile["weights"].append(weight)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+            "name": f"voice command service (pid {os.getpid()})",
+            "exporter": "profiler.py"
+        }
+
+def install_signal_handler(profiler=None, signum=signal.SIGUSR1, duration=None, output_format=None):
+    """
+    Start a capture whenever the process receives `signum`, e.g. `kill -USR1 <pid>`.
+
+    Args:
+        profiler (SamplingProfiler, optional): Profiler to use. Defaults to a new one.
+        signum (int): Signal to listen for. Defaults to SIGUSR1.
+        duration (float, optional): Seconds per capture. Defaults to PROFILE_SECONDS or 10.
+        output_format (str, optional): 'collapsed' or 'speedscope'. Defaults to PROFILE_FORMAT or 'collapsed'.
+
+    Returns:
+        SamplingProfiler: The profiler triggered by the signal
+    """
+    profiler = profiler or SamplingProfiler()
+    duration = duration or float(os.environ.get("PROFILE_SECONDS", 10))
+    output_format = output_format or os.environ.get("PROFILE_FORMAT", "collapsed")
+
+    def handle(signum, frame):
+        # Only starts the sampler thread; it prints the path when the capture is written
+        profiler.start(duration, output_format)
+
+    signal.signal(signum, handle)
+    return profiler
@@ -0,0 +1,169 @@
+import time
+import logging
+from event_log import LOGGER_NAME, log_event
+
+logger = logging.getLogger(LOGGER_NAME)
+
+class StreamSupervisor:
+    def __init__(self, open_stream, close_stream, samplerate, stream=None, frames_per_buffer=1024,
+                 stall_timeout=2.0, backoff_initial=0.05, backoff_max=2.0):
+        """
+        Read audio and reopen only the audio stream when it stalls or loses its device.
+
+        Reads never raise on an input overflow, so an overflow costs only the audio
+        PortAudio itself dropped. Reads larger than the stream's buffer are made in
+        pieces of at most frames_per_buffer, which the buffer can always hold.
+
+        Everything else the caller owns (model, recognizer state, command index,
+        ZMQ socket) stays alive, so a recovery costs one stream reopen instead of
+        a cold start. Reopen attempts back off exponentially while the device is gone.
+
+        Args:
+            open_stream (Callable): Opens and returns a new started stream, raises if the device is unavailable
+            close_stream (Callable): Closes the current stream
+            samplerate (int): Stream sample rate, used to size the waits for data
+            stream (optional): Already opened stream. Defaults to None, i.e. opened on first read.
+                Set the stream attribute when the caller reopens the stream itself.
+            frames_per_buffer (int): Buffer size the stream was opened with
+            stall_timeout (float): Seconds without new audio before the stream counts as stalled
+            backoff_initial (float): Seconds before the second reopen attempt
+            backoff_max (float): Longest wait between reopen attempts
+        """
+        self.open_stream = open_stream
+        self.close_stream = close_stream
+        self.samplerate = samplerate
+        self.stream = stream
+        self.frames_per_buffer = frames_per_buffer
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self.lost_at = None
+        self.next_attempt = 0.0
+        self.backoff = backoff_initial
+
+        self.recoveries = 0
+        self.failures = {"stall": 0, "device_error": 0}
+        self.reopen_attempts = 0
+        self.downtime_s = 0.0
+        self.last_downtime_ms = None
+        self.max_downtime_ms = 0.0
+
+    def read(self, frames):
+        """
+        Read audio from the stream, recovering it if needed.
+
+        Blocks for at most about stall_timeout (or backoff_max while the device is gone).
+
+        Args:
+            frames (int): Number of frames to read
+
+        Returns:
+            bytes: Audio data, or None if the stream is down and no audio was read
+        """
+        if self.stream is None and not self._reopen():
+            return None
+
+        pieces = []
+        while frames > 0:
+            piece = min(frames, self.frames_per_buffer)
+            try:
+                data = self._read_available(piece)
+            except OSError as e:
+                self._lost("device_error", str(e))
+                return None
+            if data is None:
+                self._lost("stall", f"no audio for {self.stall_timeout} s")
+                return None
+            pieces.append(data)
+            frames -= piece
+        return b"".join(pieces)
+
+    def _read_available(self, frames):
+        """Read once enough frames are buffered, or return None if the stream stalls"""
+        deadline = time.monotonic() + self.stall_timeout
+        while True:
+            available = self.stream.get_read_available()
+            if available >= frames:
+                # An overflow already dropped audio inside PortAudio, raising would
+                # discard this buffer as well, so keep whatever was captured
+                return self.stream.read(frames, exception_on_overflow=False)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Sleep about as long as the missing frames take to arrive
+            time.sleep(min((frames - available) / self.samplerate, remaining))
+
+    def _lost(self, reason, error):
+        """Close the broken stream and schedule an immediate reopen"""
+        self.failures[reason] += 1
+        self.lost_at = time.monotonic()
+        self.next_attempt = self.lost_at
+        self.backoff = self.backoff_initial
+        log_event(logger, logging.WARNING, "stream_lost", f"Audio stream lost ({reason}): {error}",
+                  reason=reason, error=error)
+        try:
+            self.close_stream()
+        except Exception:
+            pass  # The device may already be gone
+        self.stream = None
+
+    def _reopen(self):
+        """Wait for the next due reopen attempt and make it. Returns True if the stream is back."""
+        delay = self.next_attempt - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        self.reopen_attempts += 1
+        try:
+            self.stream = self.open_stream()
+        except Exception as e:
+            self.stream = None
+            error = str(e)
+        else:
+            error = None if self.stream is not None else "no stream opened"
+
+        if self.stream is None:
+            self.next_attempt = time.monotonic() + self.backoff
+            log_event(logger, logging.DEBUG, "stream_reopen_failed",
+                      f"Reopening audio stream failed, retrying in {self.backoff:.2f} s: {error}",
+                      error=error, retry_in_s=self.backoff)
+            self.backoff = min(self.backoff * 2, self.backoff_max)
+            return False
+
+        if self.lost_at is None:
+            return True  # First open, nothing was lost
+
+        downtime = time.monotonic() - self.lost_at
+        self.lost_at = None
+        self.backoff = self.backoff_initial
+        self.recoveries += 1
+        self.downtime_s += downtime
+        self.last_downtime_ms = downtime * 1000
+        self.max_downtime_ms = max(self.max_downtime_ms, self.last_downtime_ms)
+        log_event(logger, logging.INFO, "stream_recovered",
+                  f"Audio stream recovered after {self.last_downtime_ms:.0f} ms",
+                  downtime_ms=self.last_downtime_ms, recoveries=self.recoveries)
+        return True
+
+    def metrics(self):
+        """
+        Return recovery metrics.
+
+        Returns:
+            dict: up, recoveries, failures per reason ('stall', 'device_error'),
+            reopen_attempts, downtime_s (total, including the current outage),
+            last_downtime_ms and max_downtime_ms
+        """
+        downtime = self.downtime_s
+        if self.lost_at is not None:
+            downtime += time.monotonic() - self.lost_at
+        return {
+            "up": self.stream is not None,
+            "recoveries": self.recoveries,
+            "failures": dict(self.failures),
+            "reopen_attempts": self.reopen_attempts,
+            "downtime_s": round(downtime, 3),
+            "last_downtime_ms": self.last_downtime_ms,
+            "max_downtime_ms": self.max_downtime_ms
+        }
@@ -1,16 +1,35 @@
 import pyaudio
 import json
 from vosk import Model, KaldiRecognizer
-import chromadb
 import os
 import numpy as np
-from scipy import signal
-from embedding_handler import ONNXEmbeddingHandler
+from embedding_handler import create_embedding_handler
+from endpointer import Endpointer
+from command_store import CommandStore
+from command_matching import NBEST_TEMPERATURE, match_command, match_command_nbest
+from chunk_scheduler import ChunkScheduler
+from stream_supervisor import StreamSupervisor
+from noise_suppressor import NoiseSuppressor
+from model_pool import ModelPool
+from event_log import LOGGER_NAME, setup_logging, log_event
+from profiler import install_signal_handler
+import logging
 import sys
+import time
+import tempfile
 import zmq 
 
+logger = logging.getLogger(LOGGER_NAME)
+
 class VoskService:
-    def __init__(self, model_path = "/app/vosk-model-small-en-us", input_device_index=None, zmq_port=5555):
+    nbest_temperature = NBEST_TEMPERATURE
+
+    def __init__(self, model_path = "/app/vosk-model-small-en-us", input_device_index=None, zmq_port=5555,
+                 trailing_silence_ms=None, max_utterance_ms=None, max_alternatives=0,
+                 store_path=None, embedding_backend=None, chunk_policy="fixed", min_frames=512, max_frames=4096,
+                 index_type="flat", nprobe=8, noise_suppression=None, model_pool=None, model_key=None,
+                 match_threshold=None, grammar=None,
+                 model=None, embedding_handler=None, commands_collection=None):
         """
         Initialize the Vosk speech recognition service with ChromaDB integration.
         
@@ -18,6 +37,37 @@ class VoskService:
             model_path (str): Path to the Vosk model directory
             input_device_index (int, optional): Index of input device to use. If None, will attempt to auto-detect.
             zmq_port (int, optional): Port number for ZMQ publisher. Defaults to 5555.
+            trailing_silence_ms (int, optional): Finalize an utterance once the last word ended
+                this long ago, instead of waiting for Vosk's endpointer. Defaults to None.
+            max_utterance_ms (int, optional): Finalize an utterance once it has lasted this long. Defaults to None.
+            max_alternatives (int, optional): Number of N-best hypotheses to request from Vosk and
+                fuse with command matching. 0 uses the single best text only. Defaults to 0.
+            store_path (str, optional): Directory of a persistent command store shared across restarts
+                and processes. If None, commands are kept in an in-memory ChromaDB collection, or in a
+                temporary command store if chromadb is not installed. Defaults to None.
+            embedding_backend (str, optional): Embedding backend name from EMBEDDING_BACKENDS.
+                If None, uses the EMBEDDING_BACKEND environment variable or all-MiniLM-L6-v2.
+            chunk_policy (str, optional): How many frames to feed the recognizer per call: 'fixed'
+                (frames_per_buffer), 'adaptive' (small while speaking, large in silence) or 'offline'. Defaults to 'fixed'.
+            min_frames (int, optional): Smallest adaptive chunk. Defaults to 512.
+            max_frames (int, optional): Largest adaptive/offline chunk. Defaults to 4096.
+            index_type (str, optional): 'flat' or 'ivf' (approximate, for 100k+ phrase catalogs) search
+                in the persistent command store. Defaults to 'flat'.
+            nprobe (int, optional): IVF lists scanned per query, the recall/latency knob. Defaults to 8.
+            noise_suppression (str, optional): 'wiener' or 'spectral' to denoise audio before
+                recognition, None to feed it unchanged. Defaults to None.
+            model_pool (ModelPool, optional): Pool to take the model from instead of loading model_path.
+                Needed for switch_model(). Defaults to None.
+            model_key (str, optional): Key of the model to use from model_pool, e.g. 'en'.
+                Defaults to the pool's first model.
+            match_threshold (float, optional): Reject matches whose cosine similarity (or fused N-best
+                score) is below this, instead of always publishing the nearest command. Defaults to None.
+            grammar (List[str], optional): Restrict recognition to these phrases (plus '[unk]') with a
+                Vosk grammar, e.g. the command texts. Needs a model with a dynamic graph. Defaults to None.
+            model (vosk.Model, optional): Already loaded Vosk model to use instead of loading model_path,
+                e.g. one shared copy-on-write by a prefork parent. Defaults to None.
+            embedding_handler (optional): Already created embedding handler. Defaults to None.
+            commands_collection (optional): Already created command store/collection. Defaults to None.
         """
 
         # Initialize ZMQ publisher
@@ -27,21 +77,76 @@ class VoskService:
         print(f"ZMQ publisher started on port {zmq_port}")
         
         # Initialize Vosk - use fixed 16000 Hz sample rate for better recognition
-        self.model = Model(model_path)
+        self.model_pool = model_pool
+        self.model_key = model_key or (next(iter(model_pool.paths)) if model_pool is not None else None)
+        self._pending_model_key = None
+        self._pinned_model_key = None
+        self._utterance_active = False
+        self._store_dir = None
+        if model is not None:
+            self.model = model
+        elif model_pool is not None:
+            # Pinned so the model in use stays counted against the pool's budget
+            model_pool.pin(self.model_key)
+            try:
+                self.model = model_pool.get(self.model_key)
+            except Exception:
+                model_pool.unpin(self.model_key)
+                raise
+            self._pinned_model_key = self.model_key
+        else:
+            self.model = Model(model_path)
         self.samplerate = 16000  # Fixed 16000 Hz - optimal for Vosk models
         self.frames_per_buffer = 1024  # Number of frames per buffer
         print(f"Using sample rate for recognition: {self.samplerate} Hz")
+        self.chunk_scheduler = ChunkScheduler(chunk_policy, self.frames_per_buffer, min_frames, max_frames)
+        self.noise_suppressor = NoiseSuppressor(self.samplerate, noise_suppression) if noise_suppression else None
         
         self.p = pyaudio.PyAudio()
         self.stream = None
+        # Reopens only the audio stream on stalls and device loss
+        self.stream_supervisor = StreamSupervisor(self.reopen_stream, self.close_stream, self.samplerate,
+                                                  frames_per_buffer=self.frames_per_buffer)
         self.recognizer = None
         self.input_device_index = input_device_index
+        self.endpointer = Endpointer(self.samplerate, trailing_silence_ms, max_utterance_ms)
+        self.max_alternatives = max_alternatives
+        self.match_threshold = match_threshold
+        self.grammar = grammar
+        self._finalize_requested = False
+        
+        # Initialize embeddings handler for the selected backend
+        self.embedding_handler = embedding_handler or create_embedding_handler(embedding_backend)
+        print(f"Using embedding backend {self.embedding_handler.model_name} "
+              f"(dimension {self.embedding_handler.embedding_dim})")
         
-        # Initialize ONNX embeddings handler
-        self.embedding_handler = ONNXEmbeddingHandler()
+        if commands_collection is not None:
+            self.commands_collection = commands_collection
+            return
         
-        # Initialize ChromaDB (use PersistentClient instead of HttpClient)
-        # For local standalone usage
+        if store_path:
+            # Persistent, memory-mapped store - commands added in earlier runs are reused as is
+            # One sub-directory per backend so vectors from different backends never mix. A lazy
+            # handler that falls back to placeholder vectors on loading moves to the '-dummy' one.
+            self.commands_collection = CommandStore.for_backend(
+                store_path,
+                self.embedding_handler,
+                index_type=index_type,
+                nprobe=nprobe
+            )
+            return
+        
+        # In-memory ChromaDB for local standalone usage, an optional extra (requirements-chroma.txt)
+        try:
+            import chromadb
+        except ImportError:
+            # Removed again in stop()
+            self._store_dir = tempfile.TemporaryDirectory(prefix="commands-")
+            print(f"chromadb is not installed, keeping commands in {self._store_dir.name}")
+            self.commands_collection = CommandStore.for_backend(
+                self._store_dir.name, self.embedding_handler, index_type=index_type, nprobe=nprobe
+            )
+            return
         self.chroma_client = chromadb.Client()
         
         # Create a collection with embedding function from handler
@@ -78,58 +183,265 @@ class VoskService:
             metadatas=[{"action": action}]
         )
 
+    def add_commands(self, command_ids, command_texts, actions):
+        """
+        Add many voice commands or entities in one call, e.g. a contact or destination list.
+        
+        Args:
+            command_ids (List[str]): Unique identifiers
+            command_texts (List[str]): Texts to match against
+            actions (List[str]): Action per command
+        """
+        self.commands_collection.add(
+            documents=list(command_texts),
+            ids=list(command_ids),
+            metadatas=[{"action": action} for action in actions]
+        )
+
+    def add_example_commands(self):
+        """Add the example in-vehicle command set"""
+        self.add_command("1", "lock the doors", "lock_doors")
+        self.add_command("2", "unlock the doors", "unlock_doors")
+        self.add_command("3", "stop the car", "stop_the_car")
+        self.add_command("4", "turn on the headlights", "turn_on_the_headlights")
+        self.add_command("5", "open the window", "window_open")
+        self.add_command("6", "turn on the ac", "turn_on_the_ac")
+
     def start(self):
         """Start the audio stream and recognizer - using simplified approach"""
         print("Initializing audio stream...")
         
         try:
-            # List all available audio devices
-            print("\n=== Available Audio Input Devices ===")
-            default_device_index = self.p.get_default_input_device_info()['index'] if self.input_device_index is None else self.input_device_index
-            print(f"Default input device index: {default_device_index}")
-            
-            for i in range(self.p.get_device_count()):
-                device_info = self.p.get_device_info_by_index(i)
-                if device_info["maxInputChannels"] > 0:
-                    print(f"Device {i}: {device_info['name']}")
-                    if "pulse" in device_info['name'].lower() and self.input_device_index is None:
-                        default_device_index = i
-                        print(f"  Auto-selected PulseAudio device")
-            
-            # Use the detected device index or the one provided
-            input_device_index = default_device_index
-            print(f"Using input device index: {input_device_index}")
-            
-            # Open stream with fixed 16000 Hz rate - optimal for Vosk models
-            self.stream = self.p.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.samplerate,
-                input=True,
-                frames_per_buffer=self.frames_per_buffer,
-                input_device_index=input_device_index
-            )
-            self.stream.start_stream()
-            print(f"Audio stream started at {self.samplerate} Hz")
+            self.open_stream()
             
             # Initialize recognizer with standard rate for Vosk
-            self.recognizer = KaldiRecognizer(self.model, self.samplerate)
+            self.create_recognizer(self.samplerate)
             print("Recognizer initialized")
             
         except Exception as e:
             print(f"Error starting audio stream: {str(e)}")
             # If we have an error, just proceed without the stream for WAV file testing
-            self.recognizer = KaldiRecognizer(self.model, self.samplerate)
+            self.create_recognizer(self.samplerate)
             print("Using recognizer without stream due to error")
 
+    def open_stream(self, verbose=True):
+        """
+        Select the input device and open the audio stream.
+        
+        Args:
+            verbose (bool, optional): Print the available devices and the selection. Defaults to True.
+            
+        Returns:
+            pyaudio.Stream: The started stream, also stored in self.stream
+        """
+        # List all available audio devices
+        if verbose:
+            print("\n=== Available Audio Input Devices ===")
+        default_device_index = self.p.get_default_input_device_info()['index'] if self.input_device_index is None else self.input_device_index
+        if verbose:
+            print(f"Default input device index: {default_device_index}")
+        
+        for i in range(self.p.get_device_count()):
+            device_info = self.p.get_device_info_by_index(i)
+            if device_info["maxInputChannels"] > 0:
+                if verbose:
+                    print(f"Device {i}: {device_info['name']}")
+                if "pulse" in device_info['name'].lower() and self.input_device_index is None:
+                    default_device_index = i
+                    if verbose:
+                        print(f"  Auto-selected PulseAudio device")
+        
+        # Use the detected device index or the one provided
+        input_device_index = default_device_index
+        if verbose:
+            print(f"Using input device index: {input_device_index}")
+        
+        # Open stream with fixed 16000 Hz rate - optimal for Vosk models
+        self.stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.samplerate,
+            input=True,
+            frames_per_buffer=self.frames_per_buffer,
+            input_device_index=input_device_index
+        )
+        self.stream.start_stream()
+        self.stream_supervisor.stream = self.stream
+        if verbose:
+            print(f"Audio stream started at {self.samplerate} Hz")
+        return self.stream
+
+    def reopen_stream(self):
+        """
+        Reopen the audio stream after a failure, keeping the model, recognizer, command index and ZMQ socket.
+        
+        PortAudio only rescans devices when it is re-initialized, so a replugged
+        microphone is found again.
+        
+        Returns:
+            pyaudio.Stream: The new stream
+        """
+        self.close_stream()
+        self.p.terminate()
+        self.p = pyaudio.PyAudio()
+        return self.open_stream(verbose=False)
+
+    def create_recognizer(self, samplerate):
+        """
+        Create a recognizer with word timestamps enabled and reset the endpointer and noise suppressor.
+        
+        Args:
+            samplerate (int): Sample rate of the audio that will be fed to the recognizer
+        """
+        if self.grammar:
+            self.recognizer = KaldiRecognizer(self.model, samplerate, json.dumps(list(self.grammar) + ["[unk]"]))
+        else:
+            self.recognizer = KaldiRecognizer(self.model, samplerate)
+        self.recognizer_samplerate = samplerate
+        self.recognizer.SetWords(True)
+        self.recognizer.SetPartialWords(True)
+        if self.max_alternatives:
+            self.recognizer.SetMaxAlternatives(self.max_alternatives)
+        self.endpointer = Endpointer(samplerate, self.endpointer.trailing_silence_ms, self.endpointer.max_utterance_ms)
+        if self.noise_suppressor:
+            self.noise_suppressor = NoiseSuppressor(samplerate, self.noise_suppressor.method)
+        self._finalize_requested = False
+
+    def switch_model(self, model_key):
+        """
+        Switch recognition to another model of the pool, e.g. another language or a larger model.
+        
+        Audio processing never waits for a model load: a model that is not loaded yet
+        is loaded in the background while the current one keeps recognizing. The
+        recognizer is replaced between utterances, so no utterance is split between models.
+        
+        Args:
+            model_key (str): Key of the model in model_pool
+            
+        Returns:
+            bool: True if the switch already happened, False if it is pending
+        """
+        if self.model_pool is None:
+            raise ValueError("switch_model() needs a VoskService created with a model_pool")
+        if model_key not in self.model_pool.paths:
+            raise KeyError(f"Unknown model '{model_key}', choose one of {sorted(self.model_pool.paths)}")
+        self._pending_model_key = model_key
+        if self.model_pool.get_if_loaded(model_key) is None:
+            self.model_pool.prewarm(model_key)
+        if self._utterance_active:
+            return False
+        return self._apply_pending_model()
+
+    def _apply_pending_model(self):
+        """Replace the model and recognizer if the pending model is loaded. Returns True if it was."""
+        key = self._pending_model_key
+        # Pin before looking it up, so it cannot be evicted in between
+        self.model_pool.pin(key)
+        model = self.model_pool.get_if_loaded(key)
+        if model is None:
+            self.model_pool.unpin(key)
+            error = self.model_pool.load_error(key)
+            if error is not None:
+                # Keep the current model rather than waiting for one that will not come
+                self._pending_model_key = None
+                log_event(logger, logging.ERROR, "model_switch_failed",
+                          f"Switching to model '{key}' failed, keeping '{self.model_key}': {error}",
+                          model=key, current_model=self.model_key, error=error)
+            elif not self.model_pool.is_loading(key):
+                # Evicted again before it could be pinned
+                self.model_pool.prewarm(key)
+            return False
+        if self._pinned_model_key is not None:
+            self.model_pool.unpin(self._pinned_model_key)
+        previous_key = self.model_key
+        self.model, self.model_key, self._pending_model_key = model, self._pending_model_key, None
+        self._pinned_model_key = self.model_key
+        if self.recognizer is not None:
+            self.create_recognizer(self.recognizer_samplerate)
+        log_event(logger, logging.INFO, "model_switched", f"Switched model from '{previous_key}' to '{self.model_key}'",
+                  previous_model=previous_key, model=self.model_key)
+        return True
+
+    def request_finalize(self):
+        """Ask for the current utterance to be finalized on the next audio chunk (e.g. push-to-talk release)"""
+        self._finalize_requested = True
+
+    def process_audio(self, data):
+        """
+        Feed audio to the recognizer and apply endpointing.
+        
+        Args:
+            data (bytes): 16-bit mono audio data
+            
+        Returns:
+            tuple: (result, partial) where result is the final result dict with timing
+            information if an utterance ended, else None, and partial is the parsed partial result
+        """
+        if self._pending_model_key is not None and not self._utterance_active:
+            self._apply_pending_model()
+        if self.noise_suppressor:
+            data = self.noise_suppressor.process(data)
+        self.endpointer.advance(len(data) // 2)
+        
+        start_time = time.perf_counter()
+        if self.recognizer.AcceptWaveform(data):
+            # A finalize requested during this utterance is satisfied, not carried into the next
+            self._finalize_requested = False
+            self._utterance_active = False
+            result = self._parse_result(self.recognizer.Result())
+            return self.endpointer.annotate(result, "vosk", time.perf_counter() - start_time), None
+        
+        partial = json.loads(self.recognizer.PartialResult())
+        self._utterance_active = bool(partial.get("partial"))
+        endpoint = self.endpointer.update_partial(partial)
+        if self._finalize_requested:
+            endpoint = "forced"
+        
+        if endpoint:
+            self._finalize_requested = False
+            self._utterance_active = False
+            # FinalResult() flushes the decoder and starts a new utterance
+            result = self._parse_result(self.recognizer.FinalResult())
+            return self.endpointer.annotate(result, endpoint, time.perf_counter() - start_time), None
+        return None, partial
+
+    @staticmethod
+    def _parse_result(result_json):
+        """
+        Parse a Vosk final result.
+        
+        With SetMaxAlternatives, Vosk returns only an 'alternatives' list. The best
+        alternative's text and words are copied to the top level so callers can
+        always read result['text'].
+        """
+        result = json.loads(result_json)
+        alternatives = result.get("alternatives")
+        if alternatives:
+            result["text"] = alternatives[0].get("text", "")
+            if "result" in alternatives[0]:
+                result["result"] = alternatives[0]["result"]
+        return result
+
+    def close_stream(self):
+        """Close only the audio stream, keeping the model, recognizer, command index and ZMQ socket"""
+        if self.stream:
+            stream, self.stream = self.stream, None
+            self.stream_supervisor.stream = None
+            stream.stop_stream()
+            stream.close()
+
     def stop(self):
         """Stop the audio stream and cleanup"""
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
+        if self._pinned_model_key is not None:
+            self.model_pool.unpin(self._pinned_model_key)
+            self._pinned_model_key = None
+        self.close_stream()
         self.p.terminate()
         self.socket.close()
         self.context.term()
+        if self._store_dir is not None:
+            self._store_dir.cleanup()
+            self._store_dir = None
         print("Audio stream stopped")
 
     def predict(self, data):
@@ -142,10 +454,10 @@ class VoskService:
         Returns:
             dict: Recognition results including text and confidence
         """
-        if self.recognizer.AcceptWaveform(data):
-            result = json.loads(self.recognizer.Result())
+        result, partial = self.process_audio(data)
+        if result is not None:
             return result
-        return json.loads(self.recognizer.PartialResult())
+        return partial
 
     def find_matching_command(self, text):
         """
@@ -155,21 +467,54 @@ class VoskService:
             text (str): Recognized speech text
             
         Returns:
-            tuple: (matched_text, action) or (None, None) if no match found
+            tuple: (matched_text, action) or (None, None) if no match found or it is below match_threshold
         """
-        if not text.strip():
-            return None, None
+        return match_command(self.commands_collection, text, self.match_threshold)
 
-        results = self.commands_collection.query(
-            query_texts=[text],
-            n_results=1
-        )
+    def find_matching_command_nbest(self, alternatives):
+        """
+        Find the best matching voice command over all N-best ASR hypotheses, see match_command_nbest().
+        
+        Args:
+            alternatives (list): Vosk 'alternatives' list of {'text', 'confidence'} dicts
+            
+        Returns:
+            tuple: (matched_text, action, score) or (None, None, None) if no match found or it is below match_threshold
+        """
+        return match_command_nbest(self.commands_collection, self.embedding_handler.encode, alternatives,
+                                   self.match_threshold, self.nbest_temperature)
+
+    def handle_result(self, result):
+        """
+        Match a final recognition result to a command and publish its action via ZMQ.
+        
+        Args:
+            result (dict): Final result from process_audio; matched_command and action are added on a match
+            
+        Returns:
+            bool: True if the result contains recognized text
+        """
+        if not ("text" in result and result["text"].strip()):
+            return False
+        log_event(logger, logging.INFO, "recognized", "Recognized: %s", result["text"], text=result["text"],
+                  start_sample=result.get("start_sample"), end_sample=result.get("end_sample"),
+                  endpoint=result.get("endpoint"), decode_latency_ms=result.get("decode_latency_ms"))
+        
+        # Find matching command
+        if result.get("alternatives"):
+            matched_text, action, _ = self.find_matching_command_nbest(result["alternatives"])
+        else:
+            matched_text, action = self.find_matching_command(result["text"])
+        if matched_text:
+            result["matched_command"] = matched_text
+            result["action"] = action
+            log_event(logger, logging.INFO, "match", "Matched command: %s -> action: %s", matched_text, action,
+                      text=result["text"], matched_command=matched_text, action=action)
 
-        if results['documents'] and results['documents'][0]:
-            matched_text = results['documents'][0][0]
-            matched_action = results['metadatas'][0][0]['action']
-            return matched_text, matched_action
-        return None, None
+            # Publish the action via ZMQ
+            self.socket.send_string(f"action {action}")
+            log_event(logger, logging.DEBUG, "publish", "Published action: %s", action, action=action)
+        return True
 
     def listen(self):
         """
@@ -180,51 +525,36 @@ class VoskService:
             dict: Recognition results with command matching
         """
         self.start()
+        if not self.stream:
+            print("No audio stream available")
+            self.stop()
+            return
         print("Start speaking...")
         
         try:
             while True:
-                if not self.stream:
-                    print("No audio stream available")
-                    break
-                
-                # Simple, direct reading from the stream - like in mainAudioLive.py
-                data = self.stream.read(self.frames_per_buffer, exception_on_overflow=False)
+                # The supervisor reopens the stream if it stalls or the device goes away
+                data = self.stream_supervisor.read(self.chunk_scheduler.next_size())
+                if data is None:
+                    continue
                 
                 # Process the audio data
-                if self.recognizer.AcceptWaveform(data):
-                    result_json = self.recognizer.Result()
-                    result = json.loads(result_json)
-                    print(f"Result JSON: {result}")
-
-
-                    if "text" in result and result["text"].strip():
-                        print(f"Recognized: {result['text']}")
-                        
-                        # Find matching command
-                        matched_text, action = self.find_matching_command(result["text"])
-                        if matched_text:
-                            result["matched_command"] = matched_text
-                            result["action"] = action
-                            print(f"Matched command: {matched_text}")
-                            print(f"Action: {action}")
+                result, partial = self.process_audio(data)
+                self.chunk_scheduler.update(result, partial)
+                if result is not None:
+                    log_event(logger, logging.DEBUG, "result", "Result JSON: %s", result, result=result)
 
-                            # Publish the action via ZMQ
-                            self.socket.send_string(f"action {action}")
-                            print(f"Published action: {action}")
-                        
+                    if self.handle_result(result):
                         yield result
                 
                 # Handle partial results
-                partial_json = self.recognizer.PartialResult()
-                partial = json.loads(partial_json)
-                
-                if "partial" in partial and partial["partial"].strip():
-                    print(f"Listening: {partial['partial']}", end="\r")
+                if partial and "partial" in partial and partial["partial"].strip():
+                    log_event(logger, logging.INFO, "partial", "Listening: %s", partial["partial"],
+                              partial=partial["partial"])
                     yield partial
                 
         except Exception as e:
-            print(f"Error in listen loop: {str(e)}")
+            log_event(logger, logging.ERROR, "listen_error", f"Error in listen loop: {str(e)}", error=str(e))
         finally:
             self.stop()
             
@@ -232,28 +562,22 @@ class VoskService:
         """
         Run the service in standalone mode, similar to mainAudioLive.py
         """
-        # Add some example commands
-        self.add_command("1", "lock the doors", "lock_doors")
-        self.add_command("2", "unlock the doors", "unlock_doors")
-        self.add_command("3", "stop the car", "stop_the_car")
-        self.add_command("4", "turn on the headlights", "turn_on_the_headlights")
-        self.add_command("5", "open the window", "window_open")
-        self.add_command("6", "turn on the ac", "turn_on_the_ac")
+        self.add_example_commands()
         
         try:
             for result in self.listen():
-                if "text" in result and result["text"].strip():
-                    print(f"\nRecognized: {result['text']}")
-                    
-                    if "matched_command" in result:
-                        print(f"Matched Command: {result['matched_command']}")
-                        print(f"Action: {result['action']}")
+                # handle_result already logged the recognition and match
+                if "text" in result and result["text"].strip() and "matched_command" not in result:
+                    log_event(logger, logging.DEBUG, "no_match", "No command matched: %s", result["text"],
+                              text=result["text"])
         except KeyboardInterrupt:
             print("\nStopping recognition...")
         finally:
             self.stop()
 
 if __name__ == "__main__":
+    setup_logging()
+    
     # Check if an input device index is provided as a command line argument
     input_device_index = None
     zmq_port = 5555  # Default ZMQ port
@@ -267,6 +591,18 @@ if __name__ == "__main__":
             zmq_port = int(sys.argv[2])
             print(f"Using command line provided ZMQ port: {zmq_port}")
     
+    # Persistent command store, e.g. the ./.chroma volume in docker-compose.yml
+    store_path = os.environ.get("COMMAND_STORE_PATH")
+    
+    # Several models, e.g. VOSK_MODELS="en=/app/vosk-model-small-en-us,de=/app/vosk-model-small-de"
+    model_pool = ModelPool.from_env() if os.environ.get("VOSK_MODELS") else None
+    
+    # `kill -USR1 <pid>` samples the running service's stacks for PROFILE_SECONDS
+    install_signal_handler()
+    
     # Example usage - run standalone like mainAudioLive.py
-    service = VoskService(input_device_index=input_device_index, zmq_port=zmq_port)
+    service = VoskService(input_device_index=input_device_index, zmq_port=zmq_port, store_path=store_path,
+                          chunk_policy=os.environ.get("CHUNK_POLICY", "fixed"),
+                          noise_suppression=os.environ.get("NOISE_SUPPRESSION") or None,
+                          model_pool=model_pool, model_key=os.environ.get("VOSK_MODEL_KEY"))
     service.run_standalone()
\ No newline at end of file
@@ -0,0 +1,60 @@
+import sys
+import time
+import numpy as np
+from src.ann_index import IVFIndex
+
+def make_catalog(n, dimension, rng):
+    """Clustered unit vectors, similar to sentence embeddings of related entity names"""
+    centers = rng.standard_normal(size=(max(1, n // 50), dimension), dtype=np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)]
+    for start in range(0, n, 65536):
+        block = vectors[start:start + 65536]
+        block += 0.5 * rng.standard_normal(size=block.shape, dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
+
+def make_queries(catalog, n, rng, noise=0.05):
+    """Queries close to random catalog entries, like a slightly misrecognized entity name"""
+    queries = catalog[rng.integers(0, len(catalog), n)]
+    queries = queries + noise * rng.standard_normal(size=queries.shape, dtype=np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+def time_queries(search, queries):
+    """Run one query at a time and return (results, per-query latencies in ms)"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.array(latencies)
+
+def benchmark_ann(sizes=(10000, 100000, 1000000), dimension=384, n_queries=500, nprobes=(1, 4, 8, 16, 32, 64)):
+    """Compare brute force with the IVF index at several nprobe values"""
+    print("\n=== ANN Index Benchmark ===")
+    rng = np.random.default_rng(0)
+
+    for n in sizes:
+        catalog = make_catalog(n, dimension, rng)
+        queries = make_queries(catalog, n_queries, rng)
+
+        brute, brute_latencies = time_queries(lambda q: int(np.argmax(catalog @ q)), queries)
+
+        start = time.perf_counter()
+        index = IVFIndex(dimension)
+        index.add(catalog, np.arange(n))
+        index.merge()
+        build_s = time.perf_counter() - start
+
+        print(f"\n{n} vectors, dimension {dimension}, nlist {index.nlist}, build {build_s:.1f} s")
+        print(f"{'method':<16}{'recall@1':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        print(f"{'brute force':<16}{1.0:>10.3f}{np.percentile(brute_latencies, 50):>10.3f}"
+              f"{np.percentile(brute_latencies, 99):>10.3f}")
+        for nprobe in nprobes:
+            found, latencies = time_queries(lambda q: int(index.search(q, 1, nprobe)[1][0][0]), queries)
+            recall = np.mean([a == b for a, b in zip(found, brute)])
+            print(f"{f'ivf nprobe={nprobe}':<16}{recall:>10.3f}{np.percentile(latencies, 50):>10.3f}"
+                  f"{np.percentile(latencies, 99):>10.3f}")
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (10000, 100000, 1000000)
+    benchmark_ann(sizes)
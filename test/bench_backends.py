@@ -0,0 +1,107 @@
+import sys
+import json
+import time
+import subprocess
+import numpy as np
+from src.embedding_handler import EMBEDDING_BACKENDS, create_embedding_handler
+
+# Same command set as VoskService.run_standalone
+COMMANDS = {
+    "lock_doors": "lock the doors",
+    "unlock_doors": "unlock the doors",
+    "stop_the_car": "stop the car",
+    "turn_on_the_headlights": "turn on the headlights",
+    "window_open": "open the window",
+    "turn_on_the_ac": "turn on the ac",
+}
+
+# Paraphrased queries labeled with the expected action
+QUERIES = [
+    ("lock the doors", "lock_doors"),
+    ("lock all doors", "lock_doors"),
+    ("please lock the car doors", "lock_doors"),
+    ("unlock the doors", "unlock_doors"),
+    ("unlock my doors", "unlock_doors"),
+    ("open the door locks", "unlock_doors"),
+    ("stop the car", "stop_the_car"),
+    ("stop the vehicle now", "stop_the_car"),
+    ("pull over and stop", "stop_the_car"),
+    ("turn on the headlights", "turn_on_the_headlights"),
+    ("switch the headlights on", "turn_on_the_headlights"),
+    ("lights on please", "turn_on_the_headlights"),
+    ("open the window", "window_open"),
+    ("roll down the window", "window_open"),
+    ("open my window", "window_open"),
+    ("turn on the ac", "turn_on_the_ac"),
+    ("switch on the air conditioning", "turn_on_the_ac"),
+    ("start the ac", "turn_on_the_ac"),
+]
+
+def rss_mb():
+    """Current resident set size in MB"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def measure_backend(backend, repeats=200):
+    """Measure one backend in the current process and return its stats as a dict"""
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    handler = create_embedding_handler(backend)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    actions = list(COMMANDS)
+    command_embeddings = handler.encode([COMMANDS[action] for action in actions])
+
+    correct = 0
+    for text, expected in QUERIES:
+        query = handler.encode(text)[0]
+        correct += int(actions[int(np.argmax(command_embeddings @ query))] == expected)
+
+    latencies = []
+    for i in range(repeats):
+        text = QUERIES[i % len(QUERIES)][0]
+        start = time.perf_counter()
+        handler.encode(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "backend": backend,
+        "dimension": handler.embedding_dim,
+        "dummy": handler.using_dummy,
+        "load_ms": load_ms,
+        "rss_mb": rss_mb() - rss_before,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "top1": correct / len(QUERIES),
+    }
+
+def benchmark_backends():
+    """Compare every registered backend, each in a fresh process so memory is not shared"""
+    print("\n=== Embedding Backend Comparison ===")
+    rows = []
+    for backend in EMBEDDING_BACKENDS:
+        output = subprocess.run(
+            [sys.executable, "-m", "test.bench_backends", "--backend", backend],
+            stdout=subprocess.PIPE, text=True
+        ).stdout
+        lines = output.strip().splitlines()
+        if lines:
+            rows.append(json.loads(lines[-1]))
+        else:
+            print(f"{backend}: failed")
+
+    print(f"\n{'backend':<26}{'dim':>5}{'load ms':>10}{'RSS MB':>9}{'p50 ms':>9}{'p99 ms':>9}{'top-1':>8}")
+    for row in rows:
+        note = "  (dummy fallback)" if row["dummy"] else ""
+        print(f"{row['backend']:<26}{row['dimension']:>5}{row['load_ms']:>10.0f}{row['rss_mb']:>9.1f}"
+              f"{row['p50_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['top1']:>8.0%}{note}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--backend":
+        # Child process: the last line of output is the JSON result
+        print(json.dumps(measure_backend(sys.argv[2])))
+    else:
+        benchmark_backends()
@@ -0,0 +1,84 @@
+import sys
+import json
+import time
+import wave
+import numpy as np
+from vosk import Model, KaldiRecognizer
+from src.endpointer import Endpointer
+from src.chunk_scheduler import ChunkScheduler
+
+def run_policy(model, audio, samplerate, scheduler, trailing_silence_ms=300):
+    """
+    Feed a whole recording through a recognizer with the given chunk scheduler.
+
+    Returns:
+        tuple: (real-time factor, list of endpoint latencies in ms, number of AcceptWaveform calls)
+    """
+    recognizer = KaldiRecognizer(model, samplerate)
+    recognizer.SetWords(True)
+    recognizer.SetPartialWords(True)
+    endpointer = Endpointer(samplerate, trailing_silence_ms=trailing_silence_ms)
+
+    latencies = []
+    calls = 0
+    position = 0
+    start = time.perf_counter()
+    while position < len(audio):
+        frames = scheduler.next_size()
+        data = audio[position:position + frames].tobytes()
+        position += frames
+        calls += 1
+
+        endpointer.advance(len(data) // 2)
+        result, partial = None, None
+        if recognizer.AcceptWaveform(data):
+            result = endpointer.annotate(json.loads(recognizer.Result()), "vosk", 0.0)
+        else:
+            partial = json.loads(recognizer.PartialResult())
+            if endpointer.update_partial(partial):
+                result = endpointer.annotate(json.loads(recognizer.FinalResult()), "silence", 0.0)
+                partial = None
+        scheduler.update(result, partial)
+
+        if result and result.get("text"):
+            # Waiting for a chunk to fill up is latency too
+            latencies.append(result["endpoint_latency_ms"])
+    elapsed = time.perf_counter() - start
+
+    return elapsed / (len(audio) / samplerate), latencies, calls
+
+def benchmark_chunks(model_path, wav_paths):
+    """Sweep fixed chunk sizes and the adaptive policy, printing RTF and endpoint latency"""
+    print("\n=== Chunk Size Sweep ===")
+    model = Model(model_path)
+
+    recordings = []
+    for path in wav_paths:
+        with wave.open(path, "rb") as wf:
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            # Pad with a second of silence so the last utterance can end
+            audio = np.concatenate([audio, np.zeros(wf.getframerate(), dtype=np.int16)])
+            recordings.append((audio, wf.getframerate()))
+
+    policies = [(f"fixed {frames}", lambda frames=frames: ChunkScheduler("fixed", frames=frames))
+                for frames in (256, 512, 1024, 2048, 4000, 8000)]
+    policies.append(("adaptive 512-4096", lambda: ChunkScheduler("adaptive", min_frames=512, max_frames=4096)))
+    policies.append(("adaptive 256-8000", lambda: ChunkScheduler("adaptive", min_frames=256, max_frames=8000)))
+
+    print(f"\n{'policy':<20}{'RTF':>8}{'calls':>8}{'endpoint p50 ms':>18}{'endpoint max ms':>18}")
+    for label, make_scheduler in policies:
+        rtfs, latencies, calls = [], [], 0
+        for audio, samplerate in recordings:
+            rtf, recording_latencies, recording_calls = run_policy(model, audio, samplerate, make_scheduler())
+            rtfs.append(rtf)
+            latencies.extend(recording_latencies)
+            calls += recording_calls
+        p50 = f"{np.percentile(latencies, 50):.0f}" if latencies else "-"
+        worst = f"{max(latencies):.0f}" if latencies else "-"
+        print(f"{label:<20}{np.mean(rtfs):>8.3f}{calls:>8}{p50:>18}{worst:>18}")
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "/app/vosk-model-small-en-us"
+    wav_paths = sys.argv[2:] or ["data/test.wav", "data/test0.wav"]
+
+    benchmark_chunks(model_path, wav_paths)
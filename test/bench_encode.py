@@ -0,0 +1,85 @@
+import time
+import random
+import numpy as np
+from src.embedding_handler import ONNXEmbeddingHandler
+
+# Typical in-vehicle commands are 3-8 tokens, with the occasional long request
+COMMANDS = [
+    "lock the doors",
+    "unlock the doors",
+    "stop the car",
+    "turn on the headlights",
+    "open the window",
+    "turn on the ac",
+    "set the temperature to twenty two degrees",
+    "navigate to the nearest gas station please",
+    "play some music",
+    "call home",
+]
+LONG_COMMANDS = [
+    "could you please find me a parking spot close to the office building downtown and start navigation",
+    "remind me to pick up the groceries and the dry cleaning on the way back home this evening",
+]
+
+def command_distribution(n, seed=0):
+    """Sample n commands, roughly 95% short and 5% long"""
+    rng = random.Random(seed)
+    return [rng.choice(LONG_COMMANDS) if rng.random() < 0.05 else rng.choice(COMMANDS)
+            for _ in range(n)]
+
+def encode_unbucketed(handler, texts):
+    """Reference path: one unpadded inference call per text"""
+    embeddings = []
+    for text in texts:
+        tokens = handler._tokenize(text)
+        token_embeddings = handler.ort_session.run(None, tokens)[0]
+        pooled = handler._pool(token_embeddings, tokens['attention_mask'], 'mean')
+        embeddings.append(pooled[0] / np.linalg.norm(pooled[0]))
+    return np.array(embeddings)
+
+def time_call(fn, repeats):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+def benchmark_encode(repeats=200, batch_size=8):
+    """Compare bucketed encoding with one-shape-per-text encoding"""
+    print("\n=== Encode Benchmark ===")
+    handler = ONNXEmbeddingHandler()
+    if handler.using_dummy:
+        print("ONNX model not available, benchmark needs the real model")
+        return
+
+    texts = command_distribution(repeats * batch_size)
+    lengths = [len(handler.tokenizer.encode(t).ids) for t in set(texts)]
+    print(f"Token lengths: min {min(lengths)}, max {max(lengths)}, median {int(np.median(lengths))}")
+    print(f"Buckets: {handler.length_buckets}")
+
+    # Warm up both paths
+    handler.encode(texts[:batch_size])
+    encode_unbucketed(handler, texts[:batch_size])
+
+    # Check that padding does not change the embeddings
+    reference = encode_unbucketed(handler, COMMANDS + LONG_COMMANDS)
+    bucketed = handler.encode(COMMANDS + LONG_COMMANDS)
+    print(f"Max abs difference vs unpadded: {np.abs(reference - bucketed).max():.2e}")
+
+    for label, size in [("single command", 1), (f"batch of {batch_size}", batch_size)]:
+        batches = iter([texts[i:i + size] for i in range(0, len(texts), size)])
+        unbucketed = time_call(lambda: encode_unbucketed(handler, next(batches)), repeats)
+        batches = iter([texts[i:i + size] for i in range(0, len(texts), size)])
+        bucketed = time_call(lambda: handler.encode(next(batches)), repeats)
+
+        print(f"\n{label}:")
+        print(f"  Unbucketed: p50 {np.percentile(unbucketed, 50):.2f} ms, p99 {np.percentile(unbucketed, 99):.2f} ms")
+        print(f"  Bucketed:   p50 {np.percentile(bucketed, 50):.2f} ms, p99 {np.percentile(bucketed, 99):.2f} ms")
+
+if __name__ == "__main__":
+    print("ONNX Encode Benchmark")
+    print("=====================")
+
+    benchmark_encode()
@@ -0,0 +1,56 @@
+import sys
+import time
+import signal
+import tempfile
+import multiprocessing
+from src.prefork import PreforkLauncher, memory_usage
+
+def idle_worker(service):
+    """Worker body for the benchmark: keep the loaded service alive without audio"""
+    signal.pause()
+
+def spawned_worker(index, store_path, zmq_base_port, ready):
+    """Independently started worker that loads everything itself"""
+    from vosk_service import VoskService
+    service = VoskService(zmq_port=zmq_base_port + index, store_path=store_path)
+    ready.put(index)
+    signal.pause()
+
+def print_report(label, startup_time, report):
+    print(f"\n{label}: all workers ready in {startup_time * 1000:.0f} ms")
+    print(f"{'process':<12}{'RSS MB':>10}{'PSS MB':>10}{'unique MB':>12}")
+    for name, usage in report.items():
+        print(f"{name:<12}{usage['rss_mb']:>10.1f}{usage['pss_mb']:>10.1f}{usage['uss_mb']:>12.1f}")
+    total = sum(usage["pss_mb"] for usage in report.values())
+    print(f"{'total PSS':<12}{total:>10.1f}")
+
+def benchmark_prefork(num_workers=4):
+    """Compare forking from a preloaded parent with spawning independent workers"""
+    print("\n=== Prefork vs Independent Workers ===")
+    store_path = tempfile.mkdtemp(prefix="commands-")
+
+    launcher = PreforkLauncher(num_workers, store_path=store_path, zmq_base_port=5600,
+                               worker_target=idle_worker)
+    launcher.start()
+    time.sleep(1)  # Let the workers settle before measuring
+    print_report("prefork", launcher.startup_time, launcher.memory_report())
+    launcher.stop()
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    start = time.perf_counter()
+    workers = [context.Process(target=spawned_worker, args=(i, store_path, 5700, ready))
+               for i in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    for _ in workers:
+        ready.get()
+    startup_time = time.perf_counter() - start
+    time.sleep(1)
+    print_report("spawn", startup_time, {f"worker {i}": memory_usage(worker.pid) for i, worker in enumerate(workers)})
+    for worker in workers:
+        worker.terminate()
+        worker.join()
+
+if __name__ == "__main__":
+    benchmark_prefork(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+MODULES = ["numpy", "scipy.signal", "onnxruntime", "tokenizers", "requests", "chromadb", "vosk", "zmq", "pyaudio"]
+
+# Runs in a fresh interpreter and prints {"seconds": ..., "rss_mb": ...} for the code in SETUP
+PROBE = """
+import sys, time, json
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{setup}
+seconds = time.perf_counter() - start
+rss_kb = [int(line.split()[1]) for line in open("/proc/self/status") if line.startswith("VmRSS")][0]
+print(json.dumps({{"seconds": seconds, "rss_mb": rss_kb / 1024}}))
+"""
+
+SERVICE = """
+from vosk_service import VoskService
+service = VoskService(model_path={model_path!r}, zmq_port={port}, store_path={store_path!r})
+service.add_example_commands()
+"""
+
+def probe(setup, env=None):
+    """Run `setup` in a new interpreter and return its time and resident memory, or None if it fails"""
+    code = PROBE.format(src=SRC_DIR, setup=setup)
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               env=dict(os.environ, **(env or {})))
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def slowest_imports(module, top=10):
+    """Cumulative times of the modules `module` imports directly, from python -X importtime, slowest first"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, cwd=SRC_DIR)
+    totals = {}
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Each nesting level adds two spaces, `module` itself is at one
+        if name.startswith("   ") and not name.startswith("    "):
+            totals[name.strip()] = int(parts[1]) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+def benchmark_startup(model_path=None):
+    """Report import time and RSS of the heavy dependencies, the service module and an idle service"""
+    print("\n=== Startup Benchmark ===")
+    baseline = probe("pass")
+    print(f"\n{'import':<28}{'ms':>10}{'RSS MB':>10}{'+RSS MB':>10}")
+    print(f"{'(interpreter)':<28}{baseline['seconds'] * 1000:>10.0f}{baseline['rss_mb']:>10.1f}{0.0:>10.1f}")
+    for module in MODULES + ["vosk_service"]:
+        result = probe(f"import {module}")
+        if result is None:
+            print(f"{module:<28}{'import failed':>30}")
+            continue
+        print(f"{module:<28}{result['seconds'] * 1000:>10.0f}{result['rss_mb']:>10.1f}"
+              f"{result['rss_mb'] - baseline['rss_mb']:>10.1f}")
+
+    print("\nSlowest direct imports of vosk_service (cumulative ms):")
+    for name, ms in slowest_imports("vosk_service"):
+        print(f"  {name:<26}{ms:>10.1f}")
+
+    if model_path is None:
+        return
+    # Idle service with a warm command store: the second start reuses the stored embeddings
+    store_path = tempfile.mkdtemp(prefix="commands-")
+    setup = SERVICE.format(model_path=model_path, port=5590, store_path=store_path)
+    probe(setup)
+    print(f"\n{'idle service':<28}{'ms':>10}{'RSS MB':>10}")
+    for label, lazy in (("eager embeddings", "0"), ("EMBEDDING_LAZY=1", "1")):
+        result = probe(setup, {"EMBEDDING_LAZY": lazy})
+        if result is None:
+            print(f"{label:<28}{'failed':>20}")
+            continue
+        print(f"{label:<28}{result['seconds'] * 1000:>10.0f}{result['rss_mb']:>10.1f}")
+
+if __name__ == "__main__":
+    benchmark_startup(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,227 @@
+import json
+import time
+import wave
+import argparse
+import itertools
+import tempfile
+import numpy as np
+from src.embedding_handler import DEFAULT_BACKEND, create_embedding_handler
+from src.command_store import CommandStore
+from src.command_matching import match_command, match_command_nbest
+from test.bench_backends import COMMANDS, QUERIES
+
+# Requests the command set does not cover, the expected outcome is a rejection
+OUT_OF_DOMAIN = [
+    ("what is the weather like tomorrow", None),
+    ("play some music", None),
+    ("call my wife", None),
+    ("how far is the next gas station", None),
+]
+
+def load_labels(path, commands_path=None):
+    """
+    Load a labeled set and the command catalog it is scored against.
+
+    The labels file is either a JSON list of {"text": ..., "action": ...} and/or
+    {"wav": ..., "action": ...} entries, or an object {"commands": ..., "utterances": [...]}
+    that also holds the catalog. An action of null marks an utterance that should be
+    rejected. A catalog maps each action to its phrase or list of phrases; commands_path
+    overrides the one in the labels file. Without a path, the paraphrased queries of
+    bench_backends plus a few out-of-domain requests are used.
+
+    Returns:
+        tuple: (commands, labels)
+    """
+    commands = None
+    if path is None:
+        labels = [{"text": text, "action": action} for text, action in QUERIES + OUT_OF_DOMAIN]
+    else:
+        with open(path) as f:
+            labels = json.load(f)
+        if isinstance(labels, dict):
+            commands, labels = labels.get("commands"), labels["utterances"]
+    if commands_path is not None:
+        with open(commands_path) as f:
+            commands = json.load(f)
+    commands = commands or COMMANDS
+
+    missing = {entry["action"] for entry in labels if entry["action"] is not None} - set(commands)
+    if missing:
+        raise ValueError(f"Labeled actions {sorted(missing)} are not in the command catalog, "
+                         f"pass the catalog with --commands or in the labels file")
+    return commands, labels
+
+def command_phrases(commands):
+    """(id, phrase, action) for every phrase of a catalog"""
+    phrases = []
+    for action, texts in commands.items():
+        for i, text in enumerate([texts] if isinstance(texts, str) else texts):
+            phrases.append((f"{action}:{i}", text, action))
+    return phrases
+
+def embedding_function(handler, pooling):
+    """ChromaDB-style embedding function for a handler and pooling mode, None for the backend's own"""
+    def embed(texts):
+        return handler.encode(texts, pooling=pooling).tolist()
+    # Keeps stores built with different pooling modes apart
+    embed.embedding_tag = handler.embedding_tag if pooling is None else f"{handler.embedding_tag}:{pooling}"
+    return embed
+
+def transcribe(model, path, grammar, max_alternatives):
+    """
+    Decode a WAV file, optionally restricted to a grammar.
+
+    Returns:
+        tuple: (text, alternatives, decode ms), alternatives is a Vosk N-best list or None
+    """
+    from vosk import KaldiRecognizer
+    with wave.open(path, "rb") as wf:
+        if grammar:
+            recognizer = KaldiRecognizer(model, wf.getframerate(), json.dumps(grammar + ["[unk]"]))
+        else:
+            recognizer = KaldiRecognizer(model, wf.getframerate())
+        if max_alternatives:
+            recognizer.SetMaxAlternatives(max_alternatives)
+        segments = []
+        start = time.perf_counter()
+        while True:
+            data = wf.readframes(4000)
+            if len(data) == 0:
+                break
+            if recognizer.AcceptWaveform(data):
+                segments.append(json.loads(recognizer.Result()))
+        segments.append(json.loads(recognizer.FinalResult()))
+        decode_ms = (time.perf_counter() - start) * 1000
+
+    def clean(text):
+        return " ".join(word for word in text.split() if word != "[unk]")
+
+    if not max_alternatives:
+        return clean(" ".join(segment.get("text", "") for segment in segments)), None, decode_ms
+    spoken = [segment["alternatives"] for segment in segments
+              if segment.get("alternatives") and clean(segment["alternatives"][0].get("text", ""))]
+    alternatives = [{"text": clean(a.get("text", "")), "confidence": a.get("confidence", 0.0)}
+                    for a in (spoken[0] if spoken else [])]
+    text = " ".join(clean(segment[0].get("text", "")) for segment in spoken)
+    if len(spoken) > 1:
+        # Alternatives are per segment, a command split over segments only has its best path
+        alternatives = [{"text": text, "confidence": 0.0}]
+    return text, alternatives, decode_ms
+
+def evaluate_matching(commands, labels, backends, poolings, index_types, thresholds, grammars, nbests,
+                      model_path=None):
+    """
+    Run every combination of the given options over a labeled set and print one table.
+
+    Columns: top-1 accuracy over in-domain utterances (a rejection counts as wrong), the share
+    of in-domain utterances rejected, the share of out-of-domain utterances rejected, and
+    match latency (embedding + search) percentiles. With WAV entries, decode latency is added.
+    """
+    print("\n=== Command Matching Evaluation ===")
+    wav_entries = [entry for entry in labels if "wav" in entry]
+    model = None
+    if wav_entries:
+        if model_path is None:
+            raise ValueError("The labeled set has WAV entries, pass a Vosk model path with --model")
+        from vosk import Model
+        model = Model(model_path)
+    else:
+        grammars = ["off"]  # Grammar and N-best only affect recognition
+        nbests = [0]
+    phrases = command_phrases(commands)
+    print(f"{len(labels)} utterances, {sum(entry['action'] is None for entry in labels)} out of domain, "
+          f"{len(wav_entries)} from WAV files, {len(phrases)} command phrases for {len(commands)} actions")
+
+    handlers = {}
+    transcripts = {}  # (wav, grammar, nbest) -> (text, alternatives, decode ms)
+    header = (f"{'backend':<24}{'pooling':<8}{'index':<6}{'threshold':>10}{'grammar':>8}{'nbest':>6}"
+              f"{'top-1':>8}{'rejected':>10}{'OOD rej':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}")
+    rows = []
+    for backend, pooling, index_type, threshold, grammar, nbest in itertools.product(
+            backends, poolings, index_types, thresholds, grammars, nbests):
+        if backend not in handlers:
+            handlers[backend] = create_embedding_handler(backend)
+        handler = handlers[backend]
+
+        correct, rejected, ood_rejected, match_ms, decode_ms = 0, 0, 0, [], []
+        with tempfile.TemporaryDirectory(prefix="eval-") as store_path:
+            store = CommandStore(store_path, embedding_function(handler, pooling), index_type=index_type)
+            store.add(documents=[text for _, text, _ in phrases], ids=[command_id for command_id, _, _ in phrases],
+                      metadatas=[{"action": action} for _, _, action in phrases])
+            def encode(texts):
+                return handler.encode(texts, pooling=pooling)
+
+            for entry in labels:
+                text, alternatives = entry.get("text"), None
+                if "wav" in entry:
+                    key = (entry["wav"], grammar, nbest)
+                    if key not in transcripts:
+                        transcripts[key] = transcribe(model, entry["wav"],
+                                                      [text for _, text, _ in phrases] if grammar == "on" else None,
+                                                      nbest)
+                    text, alternatives, ms = transcripts[key]
+                    decode_ms.append(ms)
+
+                start = time.perf_counter()
+                if alternatives:
+                    _, action, _ = match_command_nbest(store, encode, alternatives, threshold)
+                else:
+                    _, action = match_command(store, text, threshold)
+                match_ms.append((time.perf_counter() - start) * 1000)
+
+                if entry["action"] is None:
+                    ood_rejected += action is None
+                else:
+                    correct += action == entry["action"]
+                    rejected += action is None
+
+        n_in_domain = sum(entry["action"] is not None for entry in labels)
+        n_ood = len(labels) - n_in_domain
+        row = (f"{backend:<24}{pooling or 'default':<8}{index_type:<6}{'-' if threshold is None else threshold:>10}"
+               f"{grammar:>8}{nbest or '-':>6}"
+               f"{correct / max(n_in_domain, 1):>8.1%}{rejected / max(n_in_domain, 1):>10.1%}"
+               f"{(f'{ood_rejected / n_ood:.1%}' if n_ood else '-'):>9}"
+               + "".join(f"{np.percentile(match_ms, q):>8.2f}" for q in (50, 95, 99)))
+        if decode_ms:
+            row += f"{np.percentile(decode_ms, 50):>12.0f}"
+        rows.append(row)
+
+    if wav_entries:
+        header += f"{'decode p50':>12}"
+    print(f"\n{header}")
+    for row in rows:
+        print(row)
+
+def parse_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def parse_poolings(value):
+    return [None if item == "default" else item for item in parse_list(value)]
+
+def parse_thresholds(value):
+    return [None if item == "none" else float(item) for item in parse_list(value)]
+
+def parse_ints(value):
+    return [int(item) for item in parse_list(value)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy versus speed of command matching configurations")
+    parser.add_argument("labels", nargs="?", help="JSON list of {text|wav, action} entries, or "
+                        "{\"commands\": {action: phrase(s)}, \"utterances\": [...]}")
+    parser.add_argument("--commands", help="JSON catalog {action: phrase or [phrases]}, overrides the labels file's")
+    parser.add_argument("--model", help="Vosk model path, needed for WAV entries")
+    parser.add_argument("--backends", type=parse_list, default=[DEFAULT_BACKEND])
+    parser.add_argument("--pooling", type=parse_poolings, default=[None],
+                        help="default (the backend's own), mean, max, cls")
+    parser.add_argument("--index", type=parse_list, default=["flat"], help="flat, ivf")
+    parser.add_argument("--thresholds", type=parse_thresholds, default=[None, 0.5, 0.7],
+                        help="minimum cosine similarity, 'none' to never reject")
+    parser.add_argument("--grammar", type=parse_list, default=["off", "on"],
+                        help="restrict WAV recognition to the command phrases")
+    parser.add_argument("--nbest", type=parse_ints, default=[0, 5],
+                        help="N-best hypotheses fused per WAV utterance, 0 for 1-best only")
+    args = parser.parse_args()
+
+    commands, labels = load_labels(args.labels, args.commands)
+    evaluate_matching(commands, labels, args.backends, args.pooling, args.index,
+                      args.thresholds, args.grammar, args.nbest, args.model)
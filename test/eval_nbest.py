@@ -0,0 +1,89 @@
+import sys
+import json
+import time
+import wave
+import numpy as np
+from src.vosk_service import VoskService
+
+# Same command set as VoskService.run_standalone
+COMMANDS = [
+    ("1", "lock the doors", "lock_doors"),
+    ("2", "unlock the doors", "unlock_doors"),
+    ("3", "stop the car", "stop_the_car"),
+    ("4", "turn on the headlights", "turn_on_the_headlights"),
+    ("5", "open the window", "window_open"),
+    ("6", "turn on the ac", "turn_on_the_ac"),
+]
+
+def decode_wav(service, path):
+    """Decode a WAV file and return the final results and total decode time in seconds"""
+    wf = wave.open(path, "rb")
+    try:
+        service.create_recognizer(wf.getframerate())
+        results = []
+        decode_time = 0.0
+        while True:
+            data = wf.readframes(4000)
+            if len(data) == 0:
+                break
+            start = time.perf_counter()
+            result, _ = service.process_audio(data)
+            decode_time += time.perf_counter() - start
+            if result and result.get("text"):
+                results.append(result)
+        start = time.perf_counter()
+        final = service._parse_result(service.recognizer.FinalResult())
+        decode_time += time.perf_counter() - start
+        if final.get("text"):
+            results.append(final)
+        return results, decode_time
+    finally:
+        wf.close()
+
+def evaluate_nbest(labels_path, max_alternatives=5):
+    """
+    Compare single-best and N-best fused command matching on a labeled WAV set.
+
+    The labels file is a JSON list of {"wav": "data/test.wav", "action": "lock_doors"}
+    entries, one per single-command recording.
+    """
+    print("\n=== N-best Fusion Evaluation ===")
+    with open(labels_path) as f:
+        labels = json.load(f)
+
+    service = VoskService()
+    for command in COMMANDS:
+        service.add_command(*command)
+
+    stats = {"single": [0, [], []], "fused": [0, [], []]}  # correct, decode times, match times
+    for entry in labels:
+        for mode, alternatives in [("single", 0), ("fused", max_alternatives)]:
+            service.max_alternatives = alternatives
+            results, decode_time = decode_wav(service, entry["wav"])
+
+            start = time.perf_counter()
+            action = None
+            if results:
+                if mode == "fused" and results[-1].get("alternatives"):
+                    _, action, _ = service.find_matching_command_nbest(results[-1]["alternatives"])
+                else:
+                    _, action = service.find_matching_command(results[-1]["text"])
+            match_time = time.perf_counter() - start
+
+            stats[mode][0] += int(action == entry["action"])
+            stats[mode][1].append(decode_time * 1000)
+            stats[mode][2].append(match_time * 1000)
+            print(f"{entry['wav']} [{mode}]: expected {entry['action']}, got {action}")
+
+    print(f"\n{'mode':<8}{'accuracy':>10}{'decode p50 ms':>16}{'match p50 ms':>15}{'match p99 ms':>15}")
+    for mode, (correct, decode_times, match_times) in stats.items():
+        print(f"{mode:<8}{correct / len(labels):>10.2%}{np.percentile(decode_times, 50):>16.1f}"
+              f"{np.percentile(match_times, 50):>15.2f}{np.percentile(match_times, 99):>15.2f}")
+    service.stop()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m test.eval_nbest labels.json [max_alternatives]")
+        sys.exit(1)
+
+    evaluate_nbest(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 5)
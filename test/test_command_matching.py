@@ -0,0 +1,35 @@
+import tempfile
+import numpy as np
+from src.command_store import CommandStore
+from src.command_matching import match_command, match_command_nbest
+from test.test_command_store import fake_embedding_function
+
+def test_command_matching():
+    """Test 1-best and N-best matching and the rejection threshold"""
+    print("\n=== Testing Command Matching ===")
+
+    embed = fake_embedding_function([])
+    with tempfile.TemporaryDirectory() as path:
+        store = CommandStore(path, embed)
+        store.add(documents=["lock the doors", "stop the car"], ids=["1", "2"],
+                  metadatas=[{"action": "lock_doors"}, {"action": "stop_the_car"}])
+
+        print(f"1-best: {match_command(store, 'stop the car')}")
+        assert match_command(store, "stop the car") == ("stop the car", "stop_the_car")
+        assert match_command(store, "   ") == (None, None)
+        # Unrelated random vectors are far below a similarity of 0.9
+        assert match_command(store, "play some music", match_threshold=0.9) == (None, None)
+
+        # The confident alternative outweighs the first one
+        alternatives = [{"text": "lock the doors", "confidence": 100.0},
+                        {"text": "stop the car", "confidence": 190.0}]
+        matched_text, action, score = match_command_nbest(store, lambda texts: np.array(embed(texts)),
+                                                          alternatives)
+        print(f"N-best: {matched_text} -> {action} ({score:.3f})")
+        assert action == "stop_the_car"
+
+if __name__ == "__main__":
+    print("Command Matching Test Suite")
+    print("===========================")
+
+    test_command_matching()
@@ -0,0 +1,187 @@
+import os
+import time
+import zlib
+import tempfile
+import multiprocessing
+import numpy as np
+from types import SimpleNamespace
+from src.command_store import CommandStore, backend_store_path
+
+def fake_embedding_function(calls):
+    """Deterministic unit-vector embeddings that record which texts were embedded"""
+    def embed(texts):
+        calls.extend(texts)
+        embeddings = []
+        for text in texts:
+            rng = np.random.default_rng(zlib.crc32(text.encode()))
+            emb = rng.normal(size=16)
+            embeddings.append(emb / np.linalg.norm(emb))
+        return embeddings
+    return embed
+
+def test_command_store():
+    """Test persistence, warm restarts and querying of the command store"""
+    print("\n=== Testing Command Store ===")
+
+    with tempfile.TemporaryDirectory() as path:
+        calls = []
+        store = CommandStore(path, fake_embedding_function(calls))
+        store.add(
+            documents=["lock the doors", "unlock the doors", "stop the car"],
+            ids=["1", "2", "3"],
+            metadatas=[{"action": "lock_doors"}, {"action": "unlock_doors"}, {"action": "stop_the_car"}]
+        )
+        print(f"Stored commands: {store.count()}")
+        assert store.count() == 3
+
+        # A second process opening the same store reuses the embeddings
+        calls.clear()
+        restarted = CommandStore(path, fake_embedding_function(calls))
+        restarted.add(documents=["lock the doors"], ids=["1"], metadatas=[{"action": "lock_doors"}])
+        print(f"Texts embedded on warm restart: {calls}")
+        assert calls == []
+
+        results = restarted.query(query_texts=["stop the car"], n_results=2)
+        print(f"Nearest to 'stop the car': {results['documents'][0]}")
+        assert results['metadatas'][0][0]['action'] == "stop_the_car"
+        assert abs(results['distances'][0][0]) < 1e-5
+
+        # Writes from one instance are visible to the other
+        restarted.add(documents=["open the window"], ids=["4"], metadatas=[{"action": "window_open"}])
+        assert store.count() == 4
+        assert store.query(query_texts=["open the window"], n_results=1)['ids'][0][0] == "4"
+        # The new command went into its own segment, the first one was not rewritten
+        print(f"Segments: {[segment['name'] for segment in store.segments]}")
+        assert len(store.segments) == 2
+
+        # Changing a command merges everything into one segment
+        store.add(documents=["open the sunroof"], ids=["4"], metadatas=[{"action": "sunroof_open"}])
+        assert len(store.segments) == 1
+        results = restarted.query(query_texts=["open the sunroof"], n_results=1)
+        assert results['metadatas'][0][0]['action'] == "sunroof_open"
+
+        # Readers never create the lock file, so a read-only volume works
+        os.remove(os.path.join(path, ".lock"))
+        reader = CommandStore(path, fake_embedding_function([]))
+        assert reader.query(query_texts=["stop the car"], n_results=1)['ids'][0][0] == "3"
+        assert not os.path.exists(os.path.join(path, ".lock"))
+
+    print("\nTest completed successfully!")
+
+def test_command_store_ivf():
+    """Test approximate search and incremental inserts with the IVF index"""
+    print("\n=== Testing Command Store with IVF Index ===")
+
+    with tempfile.TemporaryDirectory() as path:
+        store = CommandStore(path, fake_embedding_function([]), index_type="ivf", nprobe=4)
+        names = [f"contact {i}" for i in range(5000)]
+        store.add(documents=names, ids=[str(i) for i in range(len(names))],
+                  metadatas=[{"action": f"call_{i}"} for i in range(len(names))])
+        store.add(documents=["destination home"], ids=["home"], metadatas=[{"action": "navigate_home"}])
+        assert len(store.segments) == 2
+
+        results = store.query(query_texts=["contact 42", "destination home"], n_results=1)
+        print(f"Matches: {results['ids']}")
+        assert results['ids'] == [["42"], ["home"]]
+
+        # The index written with the store is reused by new readers
+        reader = CommandStore(path, fake_embedding_function([]), index_type="ivf")
+        assert reader.query(query_texts=["contact 4999"], n_results=1)['ids'][0][0] == "4999"
+
+        # Enough small writes are merged into one segment with a rebuilt index
+        for i in range(CommandStore.max_segments):
+            store.add(documents=[f"station {i}"], ids=[f"s{i}"], metadatas=[{"action": f"station_{i}"}])
+        print(f"Segments after {CommandStore.max_segments} writes: {len(store.segments)}")
+        assert len(store.segments) < CommandStore.max_segments
+        assert reader.query(query_texts=["station 3"], n_results=1)['ids'][0][0] == "s3"
+
+def test_command_store_embedding_tags():
+    """Test that placeholder vectors never end up in a real backend's store"""
+    print("\n=== Testing Command Store Embedding Tags ===")
+
+    real = SimpleNamespace(model_name="all-MiniLM-L6-v2", embedding_tag="all-MiniLM-L6-v2:384")
+    dummy = SimpleNamespace(model_name="all-MiniLM-L6-v2", embedding_tag="all-MiniLM-L6-v2:384:dummy")
+    print(f"Store paths: {backend_store_path('store', real)}, {backend_store_path('store', dummy)}")
+    assert backend_store_path("store", real) == "store/all-MiniLM-L6-v2"
+    assert backend_store_path("store", dummy) == "store/all-MiniLM-L6-v2-dummy"
+
+    # A lazy handler learns on its first encode that it fell back to placeholder vectors
+    embed = fake_embedding_function([])
+    def lazy_embed(texts):
+        lazy_embed.embedding_tag = dummy.embedding_tag
+        return embed(texts)
+    lazy_embed.embedding_tag = real.embedding_tag
+
+    with tempfile.TemporaryDirectory() as path:
+        store = CommandStore(path, lazy_embed)
+        try:
+            store.add(documents=["lock the doors"], ids=["1"], metadatas=[{"action": "lock_doors"}])
+            assert False, "placeholder vectors were written to a real store"
+        except ValueError as e:
+            print(f"Refused: {e}")
+        assert CommandStore(path, fake_embedding_function([])).count() == 0
+
+    # Opened per backend, the store follows the handler to the '-dummy' directory instead
+    class LazyHandler:
+        model_name = real.model_name
+        embedding_tag = real.embedding_tag
+        def __call__(self, texts):
+            self.embedding_tag = dummy.embedding_tag
+            return embed(texts)
+        def get_embedding_function(self):
+            return self
+
+    with tempfile.TemporaryDirectory() as path:
+        store = CommandStore.for_backend(path, LazyHandler())
+        store.add(documents=["lock the doors"], ids=["1"], metadatas=[{"action": "lock_doors"}])
+        print(f"Lazy handler's store: {store.path}")
+        assert store.path == backend_store_path(path, dummy)
+
+        # A warm real store is left alone, the first query moves its commands over
+        real_embed = fake_embedding_function([])
+        real_embed.embedding_tag = real.embedding_tag
+        CommandStore(backend_store_path(path, real), real_embed).add(
+            documents=["stop the car"], ids=["2"], metadatas=[{"action": "stop_the_car"}])
+        store = CommandStore.for_backend(path, LazyHandler())
+        assert store.path == backend_store_path(path, real)
+        results = store.query(query_texts=["stop the car"], n_results=1)
+        assert store.path == backend_store_path(path, dummy)
+        assert results['ids'][0] == ["2"]
+        assert CommandStore(backend_store_path(path, real), real_embed).count() == 1
+
+def write_commands(path, seconds):
+    """Keep adding commands to a store, run in a separate process"""
+    store = CommandStore(path, fake_embedding_function([]))
+    deadline = time.time() + seconds
+    i = 0
+    while time.time() < deadline:
+        store.add(documents=[f"command {i}"], ids=[f"w{i}"], metadatas=[{"action": f"action_{i}"}])
+        i += 1
+
+def test_command_store_concurrent_writer():
+    """Test that a reader keeps answering queries while another process writes new generations"""
+    print("\n=== Testing Command Store with a Concurrent Writer ===")
+
+    with tempfile.TemporaryDirectory() as path:
+        reader = CommandStore(path, fake_embedding_function([]))
+        reader.add(documents=["stop the car"], ids=["stop"], metadatas=[{"action": "stop_the_car"}])
+        writer = multiprocessing.Process(target=write_commands, args=(path, 2.0))
+        writer.start()
+        queries = 0
+        while writer.is_alive():
+            results = reader.query(query_texts=["stop the car"], n_results=1)
+            assert results['ids'][0][0] == "stop"
+            queries += 1
+        writer.join()
+        print(f"Queries during writes: {queries}, commands written: {reader.count() - 1}")
+        assert writer.exitcode == 0
+        assert reader.count() > 1
+
+if __name__ == "__main__":
+    print("Command Store Test Suite")
+    print("========================")
+
+    test_command_store()
+    test_command_store_ivf()
+    test_command_store_embedding_tags()
+    test_command_store_concurrent_writer()
@@ -1,5 +1,5 @@
 import numpy as np
-from src.embedding_handler import ONNXEmbeddingHandler
+from src.embedding_handler import ONNXEmbeddingHandler, LazyEmbeddingHandler
 
 def test_embedding_handler():
     """Test the ONNXEmbeddingHandler functionality"""
@@ -68,8 +68,50 @@ def test_embedding_handler():
     
     print("\nTest completed successfully!")
 
+def test_lazy_embedding_handler():
+    """Test that the lazy handler only loads the model when a text is embedded"""
+    print("\n=== Testing Lazy Embedding Handler ===")
+    
+    handler = LazyEmbeddingHandler()
+    print(f"Tag before loading: {handler.embedding_tag}")
+    assert handler.embedding_tag == "all-MiniLM-L6-v2:384"
+    assert handler.get_embedding_function() is handler
+    assert handler.handler is None
+    
+    embedding = handler.encode("Lock the doors")
+    print(f"Embedding shape after loading: {embedding.shape}")
+    assert isinstance(handler.handler, ONNXEmbeddingHandler)
+    assert embedding.shape == (1, handler.embedding_dim)
+    
+    print("\nTest completed successfully!")
+
+def test_padded_tokenizer():
+    """Test that a tokenizer.json with padding enabled does not defeat length bucketing"""
+    print("\n=== Testing Padded Tokenizer ===")
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    
+    vocab = {"[PAD]": 0, "[UNK]": 1, "lock": 2, "the": 3, "doors": 4}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.enable_padding(pad_id=0, pad_token="[PAD]", length=128)
+    
+    handler = ONNXEmbeddingHandler()
+    handler.tokenizer = ONNXEmbeddingHandler._configure_tokenizer(tokenizer, handler.max_seq_length)
+    handler._token_cache.clear()
+    
+    ids = handler._token_ids("lock the doors")
+    batches = handler._tokenize_batch(["lock the doors"])
+    print(f"Token ids: {ids}, bucket: {batches[0][1]['input_ids'].shape[1]}")
+    assert ids == [2, 3, 4]
+    assert batches[0][1]['input_ids'].shape[1] == 8
+    assert batches[0][1]['attention_mask'].sum() == 3
+    
+    print("\nTest completed successfully!")
+
 if __name__ == "__main__":
     print("ONNX Embedding Test Suite")
     print("========================")
     
-    test_embedding_handler() 
\ No newline at end of file
+    test_embedding_handler()
+    test_lazy_embedding_handler()
+    test_padded_tokenizer()
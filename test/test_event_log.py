@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import subprocess
+from src.event_log import setup_logging, log_event
+
+def test_event_log():
+    """Test that partials are rate-limited and events are written as JSON lines"""
+    print("\n=== Testing Event Log ===")
+
+    with tempfile.TemporaryDirectory() as path:
+        jsonl_path = os.path.join(path, "events.jsonl")
+        logger = setup_logging(level="INFO", jsonl_path=jsonl_path, partial_interval=60)
+
+        formatted = []
+        class Partial(str):
+            def __str__(self):
+                formatted.append(self)
+                return str.__str__(self)
+
+        for i in range(100):
+            log_event(logger, logging.INFO, "partial", "Listening: %s", Partial(i), partial=str(i))
+        log_event(logger, logging.INFO, "match", "Matched command: lock the doors", action="lock_doors")
+        log_event(logger, logging.DEBUG, "publish", "Published action: lock_doors", action="lock_doors")
+
+        # Records are written by the background listener thread
+        time.sleep(0.2)
+        with open(jsonl_path) as f:
+            events = [json.loads(line) for line in f]
+        print(f"Logged events: {[event['event'] for event in events]}")
+
+        assert [event["event"] for event in events] == ["partial", "match"]
+        assert events[0]["partial"] == "0"
+        assert events[1]["action"] == "lock_doors"
+        # Dropped partials are never formatted
+        assert formatted == ["0"]
+
+    setup_logging()
+    print("\nTest completed successfully!")
+
+def test_event_log_after_fork():
+    """Test that a forked child still writes its events"""
+    print("\n=== Testing Event Log After Fork ===")
+
+    with tempfile.TemporaryDirectory() as path:
+        jsonl_path = os.path.join(path, "events.jsonl")
+        logger = setup_logging(level="INFO", jsonl_path=jsonl_path)
+
+        pid = os.fork()
+        if pid == 0:
+            log_event(logger, logging.INFO, "match", "Matched command: stop the car", action="stop_the_car")
+            time.sleep(0.2)
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        with open(jsonl_path) as f:
+            events = [json.loads(line) for line in f]
+        print(f"Events logged by the child: {events}")
+        assert [event["action"] for event in events] == ["stop_the_car"]
+
+    setup_logging()
+    print("\nTest completed successfully!")
+
+def test_event_log_not_started_on_import():
+    """Test that importing the service's modules starts no logging thread"""
+    print("\n=== Testing Event Log on Import ===")
+
+    code = ("import threading, src.model_pool, src.stream_supervisor, src.command_store; "
+            "print(threading.active_count())")
+    threads = subprocess.check_output([sys.executable, "-c", code], text=True).strip()
+    print(f"Threads after import: {threads}")
+    assert threads == "1"
+
+if __name__ == "__main__":
+    print("Event Log Test Suite")
+    print("====================")
+
+    test_event_log()
+    test_event_log_after_fork()
+    test_event_log_not_started_on_import()
@@ -0,0 +1,117 @@
+import time
+import threading
+from src.model_pool import ModelPool
+
+class FakeModel:
+    def __init__(self, path):
+        self.path = path
+
+def slow_loader(loaded, delay=0.1, pool=None, peaks=None):
+    """Loader that records every load and takes `delay` seconds, like a real model"""
+    def load(path):
+        loaded.append(path)
+        if pool is not None:
+            # Memory held by the pool while this model is being loaded
+            peaks.append(pool.stats()["loaded_mb"])
+        time.sleep(delay)
+        return FakeModel(path)
+    return load
+
+def test_model_pool():
+    """Test lazy loading, sharing, LRU eviction under a budget and background prewarm"""
+    print("\n=== Testing Model Pool ===")
+
+    loaded = []
+    sizes = {"models/en-small": 40, "models/de-small": 45, "models/en-large": 100}
+    pool = ModelPool({"en": "models/en-small", "de": "models/de-small", "en-large": "models/en-large"},
+                     memory_budget_mb=150, loader=slow_loader(loaded), size_fn=sizes.get)
+    assert loaded == []
+
+    # Concurrent requests share one load and one model
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(pool.get("en"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Loads after 4 concurrent requests: {loaded}")
+    assert loaded == ["models/en-small"]
+    assert all(model is models[0] for model in models)
+
+    # Prewarming returns at once, the model is available when the thread is done
+    start = time.perf_counter()
+    thread = pool.prewarm("de")
+    assert time.perf_counter() - start < 0.05
+    assert pool.get_if_loaded("de") is None
+    thread.join()
+    assert pool.get_if_loaded("de").path == "models/de-small"
+
+    # 'en' was used longer ago than 'de', so loading the large model evicts it
+    pool.get("en-large")
+    stats = pool.stats()
+    print(f"Pool after loading en-large: {stats}")
+    assert stats["loaded"] == ["de", "en-large"]
+    assert stats["loaded_mb"] <= 150
+    assert stats["evictions"] == 1
+
+    pool.get("en")
+    assert loaded[-1] == "models/en-small"
+    print("\nTest completed successfully!")
+
+def test_model_pool_budget():
+    """Test that eviction happens before a load and pinned models are never evicted"""
+    print("\n=== Testing Model Pool Budget ===")
+
+    loaded, peaks = [], []
+    sizes = {"models/en-small": 40, "models/de-small": 45, "models/en-large": 100}
+    pool = ModelPool({"en": "models/en-small", "de": "models/de-small", "en-large": "models/en-large"},
+                     memory_budget_mb=150, size_fn=sizes.get)
+    pool.loader = slow_loader(loaded, delay=0, pool=pool, peaks=peaks)
+
+    pool.pin("en-large")
+    pool.get("en-large")
+    pool.get("de")
+    # Loading en and then de again each evicts the other, never the pinned en-large
+    pool.get("en")
+    pool.get("de")
+    stats = pool.stats()
+    print(f"Pool: {stats}, loaded MB during each load: {peaks}")
+    assert "en-large" in stats["loaded"]
+    assert stats["pinned"] == ["en-large"]
+    assert max(peaks) <= 150
+    assert stats["loaded_mb"] <= 150
+
+    pool.unpin("en-large")
+    pool.evict("en-large")
+    assert "en-large" not in pool.stats()["loaded"]
+    print("\nTest completed successfully!")
+
+def test_model_pool_failed_load():
+    """Test that a failed background load is reported until the next attempt"""
+    print("\n=== Testing Model Pool Failed Load ===")
+
+    def load(path):
+        if not path.startswith("models/"):
+            raise FileNotFoundError(f"No model in {path}")
+        return FakeModel(path)
+
+    pool = ModelPool({"en": "models/en-small", "de": "missing/de-small"}, loader=load, size_fn=lambda path: 40)
+    pool.prewarm("de").join()
+    print(f"Error: {pool.load_error('de')}, pool: {pool.stats()}")
+    assert "missing/de-small" in pool.load_error("de")
+    assert not pool.is_loading("de")
+    assert pool.stats()["failed"] == ["de"]
+
+    # A new attempt clears the error
+    pool.register("de", "models/de-small")
+    pool.prewarm("de").join()
+    assert pool.load_error("de") is None
+    assert pool.get_if_loaded("de").path == "models/de-small"
+
+if __name__ == "__main__":
+    print("Model Pool Test Suite")
+    print("=====================")
+
+    test_model_pool()
+    test_model_pool_budget()
+    test_model_pool_failed_load()
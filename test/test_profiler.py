@@ -0,0 +1,71 @@
+import json
+import tempfile
+import threading
+from types import SimpleNamespace
+from src.profiler import SamplingProfiler
+
+class Decoder:
+    def spin(self, stop):
+        """Stand-in for a busy decode loop"""
+        total = 0
+        while not stop.is_set():
+            total += sum(range(1000))
+        return total
+
+def test_profiler():
+    """Test that captures attribute samples to threads and methods in both formats"""
+    print("\n=== Testing Sampling Profiler ===")
+
+    stop = threading.Event()
+    worker = threading.Thread(target=Decoder().spin, args=(stop,), name="decode")
+    worker.start()
+    try:
+        with tempfile.TemporaryDirectory() as path:
+            profiler = SamplingProfiler(path, interval=0.002)
+            assert profiler.thread is None  # Nothing runs until a capture is requested
+
+            collapsed_path = profiler.start(0.3)
+            assert profiler.start(0.3) is None  # One capture at a time
+            profiler.thread.join()
+            with open(collapsed_path) as f:
+                lines = f.read().splitlines()
+            print(f"Hottest stack: {lines[0]}")
+            decode_lines = [line for line in lines if line.startswith("decode;")]
+            assert any("Decoder.spin" in line for line in decode_lines)
+
+            speedscope_path = profiler.start(0.3, "speedscope")
+            profiler.thread.join()
+            with open(speedscope_path) as f:
+                profile = json.load(f)
+            decode = [p for p in profile["profiles"] if p["name"] == "decode"][0]
+            print(f"Speedscope samples for the decode thread: {len(decode['samples'])}")
+            assert len(decode["samples"]) == len(decode["weights"]) > 10
+            assert any(frame["name"].startswith("Decoder.spin") for frame in profile["shared"]["frames"])
+    finally:
+        stop.set()
+        worker.join()
+
+    print("\nTest completed successfully!")
+
+def test_profiler_labels_without_qualname():
+    """Test that methods keep their class on Pythons without co_qualname (before 3.11)"""
+    print("\n=== Testing Frame Labels Without co_qualname ===")
+
+    code = SimpleNamespace(co_name="spin", co_argcount=2, co_varnames=("self", "stop"),
+                           co_filename="/app/src/decoder.py", co_firstlineno=7)
+    method = SimpleNamespace(f_code=code, f_locals={"self": Decoder(), "stop": None})
+    function = SimpleNamespace(f_code=SimpleNamespace(co_name="main", co_argcount=0, co_varnames=(),
+                                                      co_filename="/app/src/decoder.py", co_firstlineno=20),
+                               f_locals={})
+    labels = [SamplingProfiler._label(method), SamplingProfiler._label(function)]
+    print(f"Labels: {labels}")
+    assert labels == ["Decoder.spin (decoder.py:7)", "main (decoder.py:20)"]
+
+    print("\nTest completed successfully!")
+
+if __name__ == "__main__":
+    print("Sampling Profiler Test Suite")
+    print("============================")
+
+    test_profiler()
+    test_profiler_labels_without_qualname()
@@ -0,0 +1,86 @@
+from src.stream_supervisor import StreamSupervisor
+
+INPUT_OVERFLOWED = -9981  # pyaudio.paInputOverflowed
+
+class FakeStream:
+    """Audio stream that plays a script of 'ok', 'overflow', 'stall' and 'lost' reads"""
+    def __init__(self, script, buffer_frames=1024):
+        self.script = script
+        self.buffer_frames = buffer_frames
+        self.closed = False
+        self.reads = []
+
+    def get_read_available(self):
+        if self.script and self.script[0] == "stall":
+            return 0
+        # Never more than the host buffer holds
+        return self.buffer_frames
+
+    def read(self, frames, exception_on_overflow=True):
+        assert frames <= self.buffer_frames
+        self.reads.append(frames)
+        step = self.script.pop(0) if self.script else "ok"
+        if step == "overflow" and exception_on_overflow:
+            raise OSError(INPUT_OVERFLOWED, "Input overflowed")
+        if step == "lost":
+            raise OSError(-9999, "Unanticipated host error")
+        return b"\0\0" * frames
+
+    def close(self):
+        self.closed = True
+
+def test_stream_supervisor():
+    """Test that overflows keep the audio and stalls and device loss reopen only the stream"""
+    print("\n=== Testing Stream Supervisor ===")
+
+    # The device is gone for two reopen attempts after the stall
+    first = FakeStream(["ok", "overflow", "overflow", "ok", "stall"])
+    opens = [first, OSError(-9996, "Invalid input device"), OSError(-9996, "Invalid input device"),
+             FakeStream(["lost"]), FakeStream([])]
+
+    def open_stream():
+        stream = opens.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return stream
+
+    closed = []
+    supervisor = StreamSupervisor(open_stream, lambda: closed.append(True), 16000,
+                                  stall_timeout=0.05, backoff_initial=0.01)
+
+    reads = [supervisor.read(160) for _ in range(10)]
+    metrics = supervisor.metrics()
+    print(f"Reads: {[None if data is None else len(data) for data in reads]}")
+    print(f"Metrics: {metrics}")
+
+    # Overflows must not make PyAudio discard the captured buffer
+    assert reads[:4] == [b"\0\0" * 160] * 4
+    assert reads[-1] == b"\0\0" * 160
+    assert metrics["up"]
+    assert metrics["failures"] == {"stall": 1, "device_error": 1}
+    assert metrics["recoveries"] == 2
+    assert metrics["reopen_attempts"] == 5
+    assert metrics["max_downtime_ms"] >= 10
+    assert len(closed) == 2
+
+    print("\nTest completed successfully!")
+
+def test_stream_supervisor_large_reads():
+    """Test that reads larger than the host buffer are made in pieces instead of stalling"""
+    print("\n=== Testing Stream Supervisor Reads Larger Than the Buffer ===")
+
+    stream = FakeStream([], buffer_frames=1024)
+    supervisor = StreamSupervisor(lambda: stream, lambda: None, 16000, frames_per_buffer=1024,
+                                  stall_timeout=0.05)
+    data = supervisor.read(4096)
+    print(f"Read {len(data) // 2} frames in pieces of {stream.reads}")
+    assert len(data) == 4096 * 2
+    assert stream.reads == [1024] * 4
+    assert supervisor.metrics()["failures"] == {"stall": 0, "device_error": 0}
+
+if __name__ == "__main__":
+    print("Stream Supervisor Test Suite")
+    print("============================")
+
+    test_stream_supervisor()
+    test_stream_supervisor_large_reads()
@@ -1,8 +1,10 @@
 import time
 import wave
 import json
+from types import SimpleNamespace
 from vosk import Model, KaldiRecognizer
 from src.vosk_service import VoskService
+from src.model_pool import ModelPool
 
 def test_basic_recognition():
     """Test basic speech recognition functionality"""
@@ -145,11 +147,117 @@ def test_wav_file_with_commands():
     except Exception as outer_e:
         print(f"Error in test setup: {str(outer_e)}")
 
+def test_wav_file_endpointing():
+    """Test custom endpointing and per-utterance timing on a WAV file"""
+    print("\n=== Testing WAV File Endpointing ===")
+    
+    service = VoskService(trailing_silence_ms=300, max_utterance_ms=5000)
+    wf = None
+    try:
+        wf = wave.open("data/test.wav", "rb")
+        sample_rate = wf.getframerate()
+        service.create_recognizer(sample_rate)
+        
+        while True:
+            data = wf.readframes(1024)
+            if len(data) == 0:
+                break
+            result, _ = service.process_audio(data)
+            if result and result.get("text"):
+                print(f"Recognized: {result['text']}")
+                print(f"  Samples: {result['start_sample']} - {result['end_sample']} "
+                      f"({result['start_sample'] / sample_rate:.2f}s - {result['end_sample'] / sample_rate:.2f}s)")
+                print(f"  Endpoint: {result['endpoint']}, "
+                      f"endpoint latency: {result['endpoint_latency_ms']:.0f} ms, "
+                      f"decode latency: {result['decode_latency_ms']:.1f} ms")
+    except FileNotFoundError:
+        print("Error: test.wav file not found")
+    finally:
+        if wf:
+            wf.close()
+
+class ScriptedRecognizer:
+    """Recognizer that plays a script of (text, ended) steps, one per AcceptWaveform call"""
+    def __init__(self, script):
+        self.script = script
+        self.text = ""
+
+    def AcceptWaveform(self, data):
+        self.text, ended = self.script.pop(0)
+        return ended
+
+    def Result(self):
+        return json.dumps({"text": self.text})
+
+    def PartialResult(self):
+        return json.dumps({"partial": self.text})
+
+    def FinalResult(self):
+        return json.dumps({"text": self.text})
+
+def test_finalize_after_vosk_endpoint():
+    """Test that a finalize request ends only the utterance it was made in"""
+    print("\n=== Testing Finalize Request After a Vosk Endpoint ===")
+
+    handler = SimpleNamespace(model_name="scripted", embedding_dim=0)
+    service = VoskService(model=object(), zmq_port=5599, embedding_handler=handler, commands_collection=object())
+    try:
+        # Vosk ends the utterance itself on the chunk after the request
+        service.recognizer = ScriptedRecognizer([("lock the", False), ("lock the doors", True), ("open", False)])
+        chunk = b"\0\0" * 1024
+        assert service.process_audio(chunk)[0] is None
+        service.request_finalize()
+        result, _ = service.process_audio(chunk)
+        print(f"Ended: {result['text']} ({result['endpoint']})")
+        assert (result["text"], result["endpoint"]) == ("lock the doors", "vosk")
+
+        # The next utterance is not cut off on its first chunk
+        result, partial = service.process_audio(chunk)
+        print(f"Next chunk: result {result}, partial {partial}")
+        assert result is None and partial["partial"] == "open"
+    finally:
+        service.stop()
+
+def test_switch_to_missing_model():
+    """Test that a failed model switch is dropped and a failed start releases its pin"""
+    print("\n=== Testing Switch to a Missing Model ===")
+
+    def load(path):
+        if path == "models/missing":
+            raise FileNotFoundError(f"No model in {path}")
+        return object()
+
+    pool = ModelPool({"en": "models/en", "de": "models/missing"}, loader=load, size_fn=lambda path: 1)
+    handler = SimpleNamespace(model_name="scripted", embedding_dim=0)
+    try:
+        VoskService(model_pool=pool, model_key="de", zmq_port=5597, embedding_handler=handler,
+                    commands_collection=object())
+        assert False, "started with a missing model"
+    except FileNotFoundError:
+        assert pool.stats()["pinned"] == []
+
+    service = VoskService(model_pool=pool, zmq_port=5598, embedding_handler=handler, commands_collection=object())
+    try:
+        service.recognizer = ScriptedRecognizer([("", False)] * 100)
+        assert not service.switch_model("de")
+        while pool.load_error("de") is None:
+            time.sleep(0.01)
+        service.process_audio(b"\0\0" * 1024)
+        print(f"Model: {service.model_key}, pending: {service._pending_model_key}, pool: {pool.stats()}")
+        assert service.model_key == "en"
+        assert service._pending_model_key is None
+        assert pool.stats()["pinned"] == ["en"]
+    finally:
+        service.stop()
+
 if __name__ == "__main__":
     print("Vosk Service Test Suite")
     print("=======================")
     
     # Focus only on WAV file testing
     test_wav_file_with_commands()
+    test_wav_file_endpointing()
+    test_finalize_after_vosk_endpoint()
+    test_switch_to_missing_model()
     
     print("\nAll tests completed!") 
\ No newline at end of file
@@ -1,5 +1,15 @@
+import os
+import sys
+import json
+import time
 import zmq
 import subprocess
+import multiprocessing
+
+# The voice service publishes actions on 5555, so control requests use a separate port
+CONTROL_PORT = int(os.environ.get("ZMQ_CONTROL_PORT", 5556))
+HEALTH_CHECK_INTERVAL = 2.0  # Seconds between pings to the worker
+HEALTH_CHECK_TIMEOUT = 5.0   # Restart the worker if it has not answered for this long
 
 def bring_up_docker():
     try:
@@ -16,12 +26,228 @@ def bring_up_docker():
         print("Docker Compose Up failed:\n", e.stderr.decode())
         return False
 
+def run_worker(conn):
+    """
+    Standby recognition worker, run in its own process.
+
+    Loads the Vosk model, embeddings and commands once, then waits for
+    'activate' / 'deactivate' / 'ping' / 'profile' / 'shutdown' messages on `conn`.
+    Activating only opens the audio stream, so it takes milliseconds.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    from vosk_service import VoskService
+    from profiler import install_signal_handler
+    from event_log import setup_logging
+
+    setup_logging()
+    start = time.perf_counter()
+    service = VoskService(
+        input_device_index=int(os.environ["INPUT_DEVICE_INDEX"]) if "INPUT_DEVICE_INDEX" in os.environ else None,
+        store_path=os.environ.get("COMMAND_STORE_PATH"),
+        chunk_policy=os.environ.get("CHUNK_POLICY", "fixed"),
+        noise_suppression=os.environ.get("NOISE_SUPPRESSION") or None
+    )
+    service.add_example_commands()
+    profiler = install_signal_handler()
+    conn.send(("ready", (time.perf_counter() - start) * 1000))
+
+    active = False
+    try:
+        while True:
+            # While listening, only peek at the pipe between audio buffers
+            if conn.poll(0 if active else 0.1):
+                message = conn.recv()
+                if message == "activate":
+                    if not active:
+                        service.start()
+                        active = service.stream is not None
+                    conn.send(("active" if active else "activate_failed", None))
+                elif message == "deactivate":
+                    service.close_stream()
+                    active = False
+                    conn.send(("inactive", None))
+                elif message == "ping":
+                    conn.send(("pong", {"active": active, "stream": service.stream_supervisor.metrics()}))
+                elif message.startswith("profile"):
+                    # 'profile [seconds] [collapsed|speedscope]', sampled in the background
+                    args = message.split()
+                    try:
+                        path = profiler.start(float(args[1]) if len(args) > 1 else 10.0,
+                                              args[2] if len(args) > 2 else "collapsed")
+                        conn.send(("profile_started" if path else "profile_busy", path))
+                    except ValueError as e:
+                        conn.send(("profile_failed", str(e)))
+                elif message == "shutdown":
+                    break
+
+            if active:
+                # Returns None while the supervisor is reopening a failed stream
+                data = service.stream_supervisor.read(service.chunk_scheduler.next_size())
+                if data is None:
+                    continue
+                result, partial = service.process_audio(data)
+                service.chunk_scheduler.update(result, partial)
+                if result is not None:
+                    service.handle_result(result)
+    finally:
+        service.stop()
+
+class Orchestrator:
+    def __init__(self, port=CONTROL_PORT):
+        """
+        Keep a preloaded VoskService worker in standby and switch listening on and off over ZMQ.
+
+        Requests arrive on a ROUTER socket, so slow worker operations never block
+        other clients. Supported messages: start_voice_command, stop_voice_command, status,
+        and 'profile [seconds] [collapsed|speedscope]' to sample the worker's stacks.
+
+        Args:
+            port (int): Control port for the ROUTER socket
+        """
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.ROUTER)
+        self.socket.bind(f"tcp://*:{port}")
+        print(f"ZMQ orchestrator listening on port {port}...")
+
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.worker = None
+        self.conn = None
+        self.worker_restarts = -1
+        self.spawn_worker()
+
+    def spawn_worker(self):
+        """Start (or restart) the standby worker process"""
+        if self.worker is not None:
+            self.worker.kill()
+            self.worker.join()
+        self.conn, child_conn = self.mp_context.Pipe()
+        self.worker = self.mp_context.Process(target=run_worker, args=(child_conn,), daemon=True)
+        self.worker.start()
+        child_conn.close()
+
+        self.worker_restarts += 1
+        self.state = "loading"
+        self.spawned_at = time.perf_counter()
+        self.last_pong = self.spawned_at
+        self.last_ping = self.spawned_at
+        self.time_to_ready_ms = None
+        self.last_activation_ms = None
+        self.stream_metrics = None
+        self.pending = []  # (envelope, request, sent_at) waiting for the worker, in order
+
+    def reply(self, envelope, message):
+        self.socket.send_multipart(envelope + [message.encode()])
+
+    def status(self):
+        return {
+            "state": self.state,
+            "worker_alive": self.worker.is_alive(),
+            "worker_restarts": self.worker_restarts,
+            "time_to_ready_ms": self.time_to_ready_ms,
+            "last_activation_ms": self.last_activation_ms,
+            "stream": self.stream_metrics,
+            "seconds_since_pong": round(time.perf_counter() - self.last_pong, 3)
+        }
+
+    def handle_request(self, frames):
+        """Handle one client request; REQ and DEALER clients are both supported"""
+        envelope, message = frames[:-1], frames[-1].decode()
+        print(f"Received: {message}")
+
+        if message in ("start_voice_command", "stop_voice_command") or message.startswith("profile"):
+            request = message.split()[0]
+            if request == "profile":
+                worker_message = message
+            else:
+                worker_message = "activate" if message == "start_voice_command" else "deactivate"
+            try:
+                self.conn.send(worker_message)
+            except (BrokenPipeError, OSError):
+                # Worker died, check_health restarts it
+                self.reply(envelope, f"{request}_failed")
+                return
+            self.pending.append((envelope, request, time.perf_counter()))
+        elif message == "status":
+            self.reply(envelope, json.dumps(self.status()))
+        else:
+            self.reply(envelope, "unknown_command")
+
+    def handle_worker_message(self):
+        """Handle one message from the worker and answer the oldest pending request"""
+        event, payload = self.conn.recv()
+        now = time.perf_counter()
+        self.last_pong = now
+
+        if event == "ready":
+            self.time_to_ready_ms = (now - self.spawned_at) * 1000
+            self.state = "standby"
+            print(f"Worker ready in {self.time_to_ready_ms:.0f} ms (model load {payload:.0f} ms)")
+        elif event == "pong":
+            self.stream_metrics = payload.get("stream")
+        elif event in ("active", "inactive", "activate_failed"):
+            envelope, request, sent_at = self.pending.pop(0)
+            if event == "active":
+                self.state = "listening"
+                self.last_activation_ms = (now - sent_at) * 1000
+                print(f"Listening activated in {self.last_activation_ms:.1f} ms")
+                self.reply(envelope, "start_voice_command_ack")
+            elif event == "inactive":
+                self.state = "standby"
+                self.reply(envelope, "stop_voice_command_ack")
+            else:
+                self.reply(envelope, "start_voice_command_failed")
+        elif event in ("profile_started", "profile_busy", "profile_failed"):
+            envelope, request, sent_at = self.pending.pop(0)
+            self.reply(envelope, f"{event} {payload}" if payload else event)
+
+    def check_health(self):
+        """Ping the worker and restart it if it died or stopped answering"""
+        now = time.perf_counter()
+        # A loading worker is busy and cannot answer pings yet
+        timed_out = self.state != "loading" and now - self.last_pong > HEALTH_CHECK_TIMEOUT
+        if not self.worker.is_alive() or timed_out:
+            print(f"Worker unhealthy (alive={self.worker.is_alive()}), restarting")
+            for envelope, request, _ in self.pending:
+                self.reply(envelope, f"{request}_failed")
+            self.spawn_worker()
+        elif self.state != "loading" and now - self.last_ping > HEALTH_CHECK_INTERVAL:
+            self.conn.send("ping")
+            self.last_ping = now
+
+    def run(self):
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        try:
+            while True:
+                # The worker pipe is re-registered because a restart replaces it
+                poller.register(self.conn.fileno(), zmq.POLLIN)
+                events = dict(poller.poll(int(HEALTH_CHECK_INTERVAL * 1000 / 4)))
+
+                if events.get(self.socket) == zmq.POLLIN:
+                    self.handle_request(self.socket.recv_multipart())
+                if self.conn.fileno() in events:
+                    try:
+                        self.handle_worker_message()
+                    except EOFError:
+                        pass  # Worker died, check_health restarts it
+                poller.unregister(self.conn.fileno())
+
+                self.check_health()
+        except KeyboardInterrupt:
+            print("\nStopping orchestrator...")
+        finally:
+            if self.worker.is_alive():
+                self.conn.send("shutdown")
+                self.worker.join(timeout=5)
+            self.socket.close()
+            self.context.term()
+
 def main():
     context = zmq.Context()
     socket = context.socket(zmq.REP)
-    socket.bind("tcp://*:5555")
+    socket.bind(f"tcp://*:{CONTROL_PORT}")
 
-    print("ZMQ replier listening on port 5555...")
+    print(f"ZMQ replier listening on port {CONTROL_PORT}...")
 
     while True:
         #  Wait for next request from client
@@ -37,5 +263,8 @@ def main():
         else:
             socket.send_string("unknown_command")
 
-if name == "__main__":
-    main()
\ No newline at end of file
+if __name__ == "__main__":
+    if "--orchestrator" in sys.argv:
+        Orchestrator().run()
+    else:
+        main()